@@ -0,0 +1,73 @@
+# Times how long a large text file takes to reach its first word and the
+# peak memory it needs, comparing reading the whole file and preparing it
+# like clipboard text with the memory-mapped, lazily tokenized file reader.
+# Each run happens in a fresh process so the peak RSS (Unix only) belongs
+# to that run alone. The test file is written to a temporary directory.
+#
+#   python benchmarks/bench_file_open.py [megabytes ...]
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document import prepare_text
+from lazy_document import open_document
+
+DEFAULT_SIZES_MB = [10, 100, 500]
+MODES = ["whole", "mapped"]
+
+BLOCK = (
+    "The quick brown fox jumps over the lazy dog. Pack my box with five dozen liquor jugs;\n"
+    "sphinx of black quartz, judge my vow! Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n"
+)
+
+
+# Read the whole file and prepare it in one go, like a pasted clipboard
+def whole(path):
+    with open(path, encoding="utf-8") as file:
+        return len(prepare_text(file.read())[1])
+
+
+# Map the file and tokenize only the first block (plus the lookahead)
+def mapped(path):
+    document = open_document(path)
+    document.ensure(0)
+    return len(document.words)
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_one(mode, path):
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    words = globals()[mode](path)
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    print(f"{mode:>8} {size_mb:>5.0f} MB  {words:>11,} words ready  {elapsed * 1000:9.1f} ms  "
+          f"+{peak_rss_mb() - before:8.1f} MB peak")
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--run":
+        run_one(sys.argv[2], sys.argv[3])
+        return
+    with tempfile.TemporaryDirectory() as folder:
+        for size_mb in [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES_MB:
+            path = os.path.join(folder, f"{size_mb}mb.txt")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(BLOCK * (size_mb * 1024 * 1024 // len(BLOCK)))
+            for mode in MODES:
+                subprocess.run([sys.executable, __file__, "--run", mode, path], check=False)
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
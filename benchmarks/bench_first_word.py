@@ -0,0 +1,47 @@
+# Times how long it takes before the first word can be shown for texts of
+# growing size: tokenizing the whole text up front with prepare_text()
+# versus the pipeline, where a background thread tokenizes blocks into a
+# bounded queue and reading starts as soon as the first block is ready.
+#
+#   python benchmarks/bench_first_word.py [words ...]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document import prepare_text
+from lazy_document import LazyDocument, tokenize_blocks
+from pipeline import iter_text_blocks
+from run_benchmarks import make_text
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 5_000_000]
+
+
+def main():
+    for size in [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES:
+        raw = make_text(size)
+
+        start = time.perf_counter()
+        _, words, _ = prepare_text(raw)
+        words[0]
+        upfront = time.perf_counter() - start
+        del words
+
+        start = time.perf_counter()
+        document = LazyDocument(tokenize_blocks(iter_text_blocks(raw)), background=True)
+        document.ensure(0)
+        document.words[0]
+        pipelined = time.perf_counter() - start
+        while not document.finished:
+            document.ensure(len(document.words))
+        total = time.perf_counter() - start
+        document.close()
+
+        print(f"{size:>10,} words  up front {upfront * 1000:8.1f} ms  "
+              f"pipelined {pipelined * 1000:6.1f} ms to the first word ({total * 1000:8.1f} ms to the last)")
+
+
+if __name__ == "__main__":
+    main()
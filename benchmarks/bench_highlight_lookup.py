@@ -0,0 +1,59 @@
+# Compares the per-tick cost of finding a word's position for highlighting:
+# the old prefix scan over words[0:index] versus the precomputed WordIndex.
+#
+#   python benchmarks/bench_highlight_lookup.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document import prepare_text
+
+TOTAL_WORDS = 1_000_000
+PROBES = [1, 10, 100, 1_000, 10_000, 100_000, 999_999]
+SCAN_LIMIT = 100_000  # The prefix scan gets too slow to time beyond this
+
+
+# The position computation highlight_word_by_index used to do every tick
+def prefix_scan(index, words):
+    pos = 0
+    for i in range(index):
+        pos += len(words[i])
+        if words[i] != "\n":
+            pos += 1
+    return f"1.0 + {pos}c", f"1.0 + {pos}c + {len(words[index])}c"
+
+
+def time_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    vocabulary = ["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog."]
+    lines = []
+    for line_no in range(TOTAL_WORDS // 20):
+        lines.append(" ".join(vocabulary[(line_no + i) % len(vocabulary)] for i in range(20)))
+    text = "\n".join(lines)
+
+    start = time.perf_counter()
+    text, words, word_index = prepare_text(text)
+    build_time = time.perf_counter() - start
+    print(f"{len(word_index):,} words, index built in {build_time * 1000:.1f} ms")
+    print(f"{'word':>10}  {'prefix scan':>14}  {'word index':>12}")
+
+    for probe in PROBES:
+        indexed = time_call(lambda: word_index.tk_range(probe), 10_000)
+        if probe <= SCAN_LIMIT:
+            scanned = f"{time_call(lambda: prefix_scan(probe, words), 3) * 1e6:11.1f} us"
+        else:
+            scanned = f"{'-':>14}"
+        print(f"{probe:>10,}  {scanned}  {indexed * 1e6:9.3f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Times clipboard normalization + tokenization and the extra peak memory it
+# needs, comparing the old process_text + text.split() with the chunked
+# streaming normalizer. Each run happens in a fresh process so the peak RSS
+# (Unix only) belongs to that run alone.
+#
+#   python benchmarks/bench_normalize.py [megabytes ...]
+
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document import iter_normalized_chunks, prepare_text
+
+DEFAULT_SIZES_MB = [1, 10, 100]
+MODES = ["legacy", "stream", "prepare"]
+
+# Messy clipboard-like text: indentation, blank lines, CRLF and runs of spaces
+BLOCK = (
+    "   The quick  brown fox\tjumps over the lazy dog.  \r\n"
+    "\r\n"
+    "Pack my box with five dozen   liquor jugs; sphinx of black quartz, judge my vow!\n"
+    "\n\n"
+    "        Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n"
+)
+
+
+# The normalization main.py used to do, followed by its word split
+def legacy(text):
+    text = '\n'.join([' '.join(line.strip().split()) for line in text.split('\n') if line.strip()])
+    text = text.replace("\n", "\n")
+    return len(text.split())
+
+
+# The chunked generator alone: normalized text plus offset tables, no word list
+def stream(text):
+    pieces = []
+    count = 0
+    for piece, words, chunk_index in iter_normalized_chunks(text):
+        pieces.append(piece)
+        count += len(words)
+    "".join(pieces)
+    return count
+
+
+def prepare(text):
+    return len(prepare_text(text)[1])
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_one(mode, size_mb):
+    text = BLOCK * (size_mb * 1024 * 1024 // len(BLOCK))
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    words = globals()[mode](text)
+    elapsed = time.perf_counter() - start
+    extra = peak_rss_mb() - before
+    print(f"{mode:>8} {size_mb:>5} MB  {words:>11,} words  {elapsed:8.2f} s  "
+          f"+{extra:8.1f} MB peak ({extra / size_mb:4.1f}x input)")
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--run":
+        run_one(sys.argv[2], int(sys.argv[3]))
+        return
+    for size_mb in [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES_MB:
+        for mode in MODES:
+            subprocess.run([sys.executable, __file__, "--run", mode, str(size_mb)], check=False)
+
+
+if __name__ == "__main__":
+    main()
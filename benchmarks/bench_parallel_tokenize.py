@@ -0,0 +1,57 @@
+# Times normalizing + tokenizing a large text with prepare_text() on one
+# core versus prepare_text_parallel() with a growing number of worker
+# processes, and checks both produce the same document.
+#
+#   python benchmarks/bench_parallel_tokenize.py [--mb 200] [--workers 1 2 4 8]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document import prepare_text
+from parallel_tokenize import prepare_text_parallel
+
+# Messy clipboard-like text: indentation, blank lines, CRLF and runs of spaces
+BLOCK = (
+    "   The quick  brown fox\tjumps over the lazy dog.  \r\n"
+    "\r\n"
+    "Pack my box with five dozen   liquor jugs; sphinx of black quartz, judge my vow!\n"
+    "\n\n"
+    "        Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n"
+)
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Times prepare_text() on one core against "
+                                     "prepare_text_parallel() with several worker processes.")
+    parser.add_argument("--mb", type=int, default=200, help="size of the input in megabytes")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[count for count in (2, 4, 8, 16) if count <= cores] or [2],
+                        help="worker counts to try (default: powers of two up to the core count)")
+    args = parser.parse_args()
+
+    raw = BLOCK * (args.mb * 1024 * 1024 // len(BLOCK))
+    print(f"{args.mb} MB input, {cores} core(s)")
+
+    start = time.perf_counter()
+    text, words, word_index = prepare_text(raw)
+    serial = time.perf_counter() - start
+    print(f"  serial      {serial:7.2f} s  {len(words):,} words")
+    del words
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        parallel_text, _, parallel_index = prepare_text_parallel(raw, workers)
+        elapsed = time.perf_counter() - start
+        same = parallel_text == text and parallel_index.starts == word_index.starts
+        print(f"  {workers:>2} workers  {elapsed:7.2f} s  {serial / elapsed:5.2f}x  "
+              f"{'identical' if same else 'DIFFERENT'}")
+        del parallel_text, parallel_index
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Measures how late each word is displayed relative to its ideal time
+# (start + n / speed) for the old worker-thread loop, which slept 1/speed
+# and touched widgets from the thread, and the root.after tick loop that
+# renders on the Tk event loop. Needs a display.
+#
+#   python benchmarks/bench_tick_jitter.py [words_per_second] [words]
+
+import os
+import statistics
+import sys
+import threading
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document import prepare_text
+from pacing import DeadlineScheduler
+
+SPEED = float(sys.argv[1]) if len(sys.argv) > 1 else 15.0
+WORDS = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+
+
+def make_window(text):
+    root = tk.Tk()
+    label = tk.Label(root, text="", font=("Helvetica", 22), wraplength=580)
+    label.pack()
+    text_widget = tk.Text(root, wrap="word", height=10, width=70)
+    text_widget.pack()
+    text_widget.insert("1.0", text)
+    text_widget.tag_configure("highlight", foreground="#AD0321")
+    return root, label, text_widget
+
+
+def show(label, text_widget, word, start_idx, end_idx, previous):
+    label.config(text=word)
+    if previous:
+        text_widget.tag_remove("highlight", *previous)
+    text_widget.tag_add("highlight", start_idx, end_idx)
+    text_widget.see(start_idx)
+
+
+def run_thread(text, words, word_index):
+    root, label, text_widget = make_window(text)
+    shown = []
+
+    def worker():
+        start = time.perf_counter()
+        previous = None
+        for i in range(WORDS):
+            show(label, text_widget, words[i], *word_index.tk_range(i), previous)
+            previous = word_index.tk_range(i)
+            shown.append(time.perf_counter() - start - i / SPEED)
+            time.sleep(1 / SPEED)
+        root.after(0, root.destroy)
+
+    root.after(200, lambda: threading.Thread(target=worker, daemon=True).start())
+    root.mainloop()
+    return shown
+
+
+def run_after(text, words, word_index):
+    root, label, text_widget = make_window(text)
+    shown = []
+    scheduler = DeadlineScheduler(SPEED)
+    state = {"i": 0, "previous": None}
+
+    def tick():
+        i = state["i"]
+        if i >= WORDS:
+            root.destroy()
+            return
+        show(label, text_widget, words[i], *word_index.tk_range(i), state["previous"])
+        state["previous"] = word_index.tk_range(i)
+        shown.append(time.perf_counter() - scheduler.start_time - i / SPEED)
+        state["i"] = i + 1
+        root.after(round(scheduler.advance() * 1000), tick)
+
+    def begin():
+        scheduler.start()
+        tick()
+
+    root.after(200, begin)
+    root.mainloop()
+    return shown
+
+
+def report(name, lateness):
+    ms = sorted(value * 1000 for value in lateness)
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    print(f"{name:>14}: p50 {statistics.median(ms):8.2f} ms  p99 {p99:8.2f} ms  "
+          f"last word {lateness[-1] * 1000:8.2f} ms  "
+          f"stdev {statistics.pstdev(ms):7.2f} ms")
+
+
+def main():
+    text = "\n".join(" ".join(f"word{i * 12 + j}" for j in range(12)) for i in range(WORDS // 12 + 1))
+    text, words, word_index = prepare_text(text)
+    try:
+        before = run_thread(text, words, word_index)
+        after = run_after(text, words, word_index)
+    except tk.TclError as error:
+        sys.exit(f"This benchmark needs a display: {error}")
+    print(f"{WORDS} words at {SPEED} words per second, lateness vs. start + n / speed")
+    report("thread + sleep", before)
+    report("root.after", after)
+
+
+if __name__ == "__main__":
+    main()
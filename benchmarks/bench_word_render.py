@@ -0,0 +1,89 @@
+# Measures the per-word cost of showing words in the old reveal label (a
+# tk.Label whose text is reconfigured every tick) against the WordCanvas
+# (one canvas text item moved and re-texted in place), each followed by
+# update_idletasks() so layout and redraw are included. Also counts the
+# <Configure> events the window gets, i.e. how often showing a word made
+# Tk lay the window out again. Needs a display.
+#
+#   python benchmarks/bench_word_render.py [words]
+
+import os
+import statistics
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from run_benchmarks import make_text
+from word_view import WordCanvas
+
+WORDS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+FONT = ("Helvetica", 22)
+
+
+def make_window():
+    root = tk.Tk()
+    root.geometry("515x575")
+    relayouts = []
+    root.bind("<Configure>", lambda event: relayouts.append(event.widget))
+    return root, relayouts
+
+
+def time_words(root, words, show):
+    root.update()
+    costs = []
+    for word in words:
+        start = time.perf_counter()
+        show(word)
+        root.update_idletasks()
+        costs.append(time.perf_counter() - start)
+    return costs
+
+
+def run_label(words):
+    root, relayouts = make_window()
+    label = tk.Label(root, text="", font=FONT, wraplength=580, justify="center")
+    label.pack(pady=28)
+    tk.Text(root, height=10, width=70).pack(fill="both", expand=True)
+    root.update()
+    relayouts.clear()
+    costs = time_words(root, words, lambda word: label.config(text=word))
+    root.destroy()
+    return costs, len(relayouts)
+
+
+def run_canvas(words):
+    root, relayouts = make_window()
+    canvas = tk.Canvas(root, width=500, height=84, highlightthickness=0)
+    canvas.pack(pady=4, fill="x")
+    word_view = WordCanvas(canvas, FONT, "black")
+    tk.Text(root, height=10, width=70).pack(fill="both", expand=True)
+    root.update()
+    relayouts.clear()
+    costs = time_words(root, words, word_view.show_word)
+    root.destroy()
+    return costs, len(relayouts)
+
+
+def report(name, costs, relayouts):
+    us = sorted(cost * 1e6 for cost in costs)
+    p99 = us[min(len(us) - 1, int(len(us) * 0.99))]
+    print(f"{name:>7}: mean {statistics.fmean(us):8.1f} us  p50 {statistics.median(us):8.1f} us  "
+          f"p99 {p99:8.1f} us  window <Configure> events {relayouts}")
+
+
+def main():
+    words = make_text(WORDS).split()
+    try:
+        label = run_label(words)
+        canvas = run_canvas(words)
+    except tk.TclError as error:
+        sys.exit(f"This benchmark needs a display: {error}")
+    print(f"{len(words)} words, cost per word including update_idletasks()")
+    report("Label", *label)
+    report("Canvas", *canvas)
+
+
+if __name__ == "__main__":
+    main()
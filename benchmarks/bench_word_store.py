@@ -0,0 +1,55 @@
+# Compares the memory taken by the words of a document stored as a list of
+# str objects (text.split(), what reveal used to index) with the Words view,
+# which slices each word out of the normalized text on demand using the
+# WordIndex tables the text view needs anyway. Also times fetching a word
+# both ways, since the view pays for a slice on every displayed word.
+#
+#   python benchmarks/bench_word_store.py [words ...]
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document import Words, prepare_text
+from run_benchmarks import make_text
+
+DEFAULT_SIZES = [100_000, 1_000_000, 5_000_000]
+FETCHES = 200_000
+
+
+# Returns (result, bytes still allocated by it) of calling `build`
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, allocated
+
+
+def fetch_time(words):
+    count = len(words)
+    start = time.perf_counter()
+    for index in range(0, FETCHES * 7, 7):
+        words[index % count]
+    return (time.perf_counter() - start) / FETCHES
+
+
+def main():
+    for size in [int(size) for size in sys.argv[1:]] or DEFAULT_SIZES:
+        text, _, word_index = prepare_text(make_text(size))
+        tables = sum(table.itemsize * len(table) for table in
+                     (word_index.starts, word_index.ends, word_index.lines, word_index.columns,
+                      word_index.sentences, word_index.paragraphs))
+        word_list, list_bytes = measure(text.split)
+        view, view_bytes = measure(lambda: Words(text, word_index))
+        print(f"{len(view):>11,} words  text {len(text) / 2 ** 20:7.1f} MB  index tables {tables / 2 ** 20:7.1f} MB  "
+              f"list {list_bytes / 2 ** 20:8.1f} MB  view {view_bytes:6} B  "
+              f"fetch list {fetch_time(word_list) * 1e9:5.0f} ns / view {fetch_time(view) * 1e9:5.0f} ns")
+        del word_list, view
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# Stand-ins that let the reading pipeline run without a display or real time
+
+
+# Accepts the Text widget calls VirtualTextView/HighlightManager make and
+# only remembers what a real widget would hold
+class NullTextWidget:
+    def __init__(self):
+        self.content_length = 0
+        self.inserted = 0  # Characters inserted over the widget's lifetime
+        self.tagged = None
+
+    def tag_configure(self, tag, **options):
+        pass
+
+    def delete(self, start, end):
+        self.content_length = 0
+
+    def insert(self, index, text):
+        self.content_length += len(text)
+        self.inserted += len(text)
+
+    def tag_remove(self, tag, start, end):
+        pass
+
+    def tag_add(self, tag, start, end):
+        self.tagged = (start, end)
+
+    def see(self, index):
+        pass
+
+
+# A clock that only moves when someone sleeps or does (simulated) work
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def work(self, seconds):
+        self.now += seconds
@@ -0,0 +1,209 @@
+# Headless benchmark suite for the reading pipeline. Times normalization,
+# tokenization, highlight lookup, scheduler pacing and whole engine sessions
+# at several document sizes, using a null Text widget, the null renderer and
+# a fake clock so no display (and no real waiting) is needed. Results are printed as a table and written as
+# JSON for regression tracking.
+#
+#   python benchmarks/run_benchmarks.py [--sizes 1000 10000 ...] [--output results.json]
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document import iter_normalized_chunks, prepare_text
+from engine import ReadingEngine
+from fakes import FakeClock, NullTextWidget
+from pacing import DeadlineScheduler
+from renderers import NullRenderer
+from text_view import VirtualTextView
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+HIGHLIGHT_SAMPLE = 20_000  # Consecutive words highlighted at a few positions in the document
+SCHEDULER_TICKS = 1_000_000  # Upper bound on simulated ticks per size
+SPEED = 15.0  # Words per second used for pacing runs (the slider's maximum)
+
+VOCABULARY = ["the", "reader", "flashes", "one", "word", "at", "a", "time,", "so", "long",
+              "documents", "must", "stay", "responsive.", "Speed", "matters;", "latency", "too!"]
+
+
+# Function to build clipboard-like text with n words, ragged lines and blank lines
+def make_text(n, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    remaining = n
+    while remaining > 0:
+        count = min(remaining, rng.randint(4, 18))
+        lines.append("  " + "   ".join(rng.choice(VOCABULARY) for _ in range(count)) + " \r")
+        if rng.random() < 0.2:
+            lines.append("")
+        remaining -= count
+    return "\n".join(lines)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def bench_normalize(raw, words):
+    start = time.perf_counter()
+    pieces = [piece for piece, _, _ in iter_normalized_chunks(raw)]
+    "".join(pieces)
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "ns_per_word": elapsed / words * 1e9}
+
+
+def bench_tokenize(raw, words):
+    start = time.perf_counter()
+    document = prepare_text(raw)
+    elapsed = time.perf_counter() - start
+    return {"seconds": elapsed, "ns_per_word": elapsed / words * 1e9}, document
+
+
+# Highlights runs of consecutive words at the start, middle and end of the
+# document, including the window swaps the view does along the way
+def bench_highlight(text, word_index):
+    widget = NullTextWidget()
+    view = VirtualTextView(widget, "#AD0321")
+    view.load(text, word_index)
+    total = len(word_index)
+    per_word = []
+
+    for fraction in (0.0, 0.5, 1.0):
+        first = min(int(total * fraction), max(0, total - HIGHLIGHT_SAMPLE))
+        for index in range(first, min(total, first + HIGHLIGHT_SAMPLE)):
+            start = time.perf_counter()
+            view.highlight_word(index)
+            per_word.append(time.perf_counter() - start)
+
+    return {
+        "mean_us": statistics.fmean(per_word) * 1e6,
+        "p99_us": percentile(per_word, 0.99) * 1e6,
+        "max_widget_chars": widget.content_length,
+    }
+
+
+# Drives the deadline scheduler with a fake clock and random render costs
+# (occasionally longer than a whole interval) and measures how late each
+# word is against start + n / speed, plus the scheduler's own overhead
+def bench_scheduler(words):
+    rng = random.Random(1)
+    clock = FakeClock()
+    scheduler = DeadlineScheduler(SPEED, clock=clock, sleep=clock.sleep)
+    ticks = min(words, SCHEDULER_TICKS)
+    lateness = []
+    overhead = 0.0
+
+    scheduler.start()
+    for _ in range(ticks):
+        lateness.append(clock() - scheduler.next_deadline)
+        clock.work(rng.expovariate(1 / 0.004) if rng.random() > 0.001 else 0.5)
+        start = time.perf_counter()
+        scheduler.wait()
+        overhead += time.perf_counter() - start
+
+    return {
+        "ticks": ticks,
+        "lateness_p50_ms": percentile(lateness, 0.5) * 1000,
+        "lateness_p99_ms": percentile(lateness, 0.99) * 1000,
+        "lateness_max_ms": max(lateness) * 1000,
+        "achieved_wps": scheduler.achieved_speed(),
+        "target_wps": SPEED,
+        "resyncs": scheduler.resyncs,
+        "overhead_ns_per_tick": overhead / ticks * 1e9,
+    }
+
+
+# Runs a ReadingEngine session over the last words of the document with
+# the null renderer on a fake clock, timing the engine's own work per tick
+# (finding the word, rendering, recording timings and rescheduling)
+def bench_engine(text, words, word_index):
+    clock = FakeClock()
+    renderer = NullRenderer(clock, clock.sleep)
+    engine = ReadingEngine(renderer, clock=clock)
+    ticks = min(len(words), SCHEDULER_TICKS)
+    engine.load(text, words, word_index, position=len(words) - ticks)
+
+    start = time.perf_counter()
+    engine.resume(SPEED)
+    renderer.run()
+    elapsed = time.perf_counter() - start
+    return {
+        "ticks": renderer.shown,
+        "ns_per_tick": elapsed / renderer.shown * 1e9,
+        "simulated_seconds": clock(),
+    }
+
+
+# Same measurement against the real clock and time.sleep, which adds the
+# operating system's wake-up jitter (kept short since it runs in real time)
+def bench_real_clock_jitter(ticks=150, speed=100.0):
+    scheduler = DeadlineScheduler(speed)
+    lateness = []
+    scheduler.start()
+    for _ in range(ticks):
+        lateness.append(time.perf_counter() - scheduler.next_deadline)
+        scheduler.wait()
+    return {
+        "ticks": ticks,
+        "target_wps": speed,
+        "lateness_p50_ms": percentile(lateness, 0.5) * 1000,
+        "lateness_p99_ms": percentile(lateness, 0.99) * 1000,
+        "achieved_wps": scheduler.achieved_speed(),
+    }
+
+
+def run(sizes):
+    results = []
+    for words in sizes:
+        raw = make_text(words)
+        normalize = bench_normalize(raw, words)
+        tokenize, (text, word_list, word_index) = bench_tokenize(raw, words)
+        del raw
+        highlight = bench_highlight(text, word_index)
+        scheduler = bench_scheduler(words)
+        engine = bench_engine(text, word_list, word_index)
+        result = {"words": words, "normalize": normalize, "tokenize": tokenize,
+                  "highlight": highlight, "scheduler": scheduler, "engine": engine}
+        results.append(result)
+        print(f"{words:>11,} words  normalize {normalize['ns_per_word']:7.0f} ns/word  "
+              f"tokenize {tokenize['ns_per_word']:7.0f} ns/word  "
+              f"highlight {highlight['mean_us']:6.2f} us (p99 {highlight['p99_us']:6.2f})  "
+              f"late p99 {scheduler['lateness_p99_ms']:6.2f} ms  "
+              f"{scheduler['achieved_wps']:.2f}/{SPEED:.0f} wps  "
+              f"engine {engine['ns_per_tick']:6.0f} ns/tick", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmark suite for the reading pipeline: times "
+                                     "normalization, tokenization, highlight lookup, pacing and whole "
+                                     "engine sessions at several document sizes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="document sizes in words")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": run(args.sizes),
+        "real_clock_jitter": bench_real_clock_jitter(),
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import codecs
+import os
+import posixpath
+import re
+import zipfile
+from html.parser import HTMLParser
+from urllib.parse import unquote
+from xml.etree import ElementTree
+
+BLOCK_SIZE = 1 << 16  # Bytes of an HTML file fed to the parser per block
+
+# Tags that start a new line (paragraph) of text, and tags whose content is never shown
+BLOCK_TAGS = frozenset((
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption", "footer",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "nav", "ol", "p", "pre", "section",
+    "table", "td", "th", "tr", "ul",
+))
+SKIPPED_TAGS = frozenset(("head", "script", "style", "template", "noscript"))
+
+CONTAINER_NS = "{urn:oasis:names:tc:opendocument:xmlns:container}"
+OPF_NS = "{http://www.idpf.org/2007/opf}"
+
+charset_pattern = re.compile(rb"""(?:charset|encoding)\s*=\s*["']?([\w.:-]+)""", re.IGNORECASE)
+
+
+# Collects the visible text of an HTML document as lines: block-level tags
+# break lines, while line breaks in the markup are just whitespace
+class TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skipping = 0  # Depth inside tags whose content is not shown
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self.skipping += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self.skipping = max(0, self.skipping - 1)
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.parts.append(data.replace("\r", " ").replace("\n", " "))
+
+    # Returns the text of the lines completed so far (all of it if `final`)
+    def take_lines(self, final=False):
+        text = "".join(self.parts)
+        cut = len(text) if final else text.rfind("\n")
+        if cut == -1:
+            self.parts = [text]
+            return ""
+        self.parts = [text[cut + 1:]]
+        return text[:cut]
+
+
+# Returns the encoding of an HTML/XHTML document from its BOM or its
+# <meta charset> / <?xml encoding?> declaration, defaulting to UTF-8
+def sniff_encoding(head):
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    match = charset_pattern.search(head[:1024])
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode("ascii")).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+def decoder_for(head):
+    encoding = sniff_encoding(head)
+    return codecs.getincrementaldecoder("utf-8-sig" if encoding == "utf-8" else encoding)(errors="replace")
+
+
+# Yields (text, fraction of the file read) for blocks of whole lines of an
+# HTML file, parsing it a block at a time
+def iter_html_blocks(path, block_size=BLOCK_SIZE):
+    size = os.path.getsize(path) or 1
+    extractor = TextExtractor()
+    with open(path, "rb") as file:
+        data = file.read(block_size)
+        decoder = decoder_for(data)
+        while data:
+            extractor.feed(decoder.decode(data))
+            lines = extractor.take_lines()
+            if lines:
+                yield lines, file.tell() / size
+            data = file.read(block_size)
+    extractor.feed(decoder.decode(b"", final=True))
+    extractor.close()
+    yield extractor.take_lines(final=True), 1.0
+
+
+# Returns the text of one HTML/XHTML document as lines
+def html_text(data):
+    extractor = TextExtractor()
+    extractor.feed(decoder_for(data).decode(data, final=True))
+    extractor.close()
+    return extractor.take_lines(final=True)
+
+
+# Returns the archive names of an EPUB's chapters in reading order, from
+# the spine of the package document named in META-INF/container.xml
+def epub_spine(book):
+    try:
+        container = ElementTree.fromstring(book.read("META-INF/container.xml"))
+        package_path = container.find(f"{CONTAINER_NS}rootfiles/{CONTAINER_NS}rootfile").get("full-path")
+        package = ElementTree.fromstring(book.read(package_path))
+    except (KeyError, AttributeError, ElementTree.ParseError) as error:
+        raise ValueError(f"not a valid EPUB: {error}") from error
+
+    folder = posixpath.dirname(package_path)
+    manifest = {item.get("id"): item for item in package.iter(f"{OPF_NS}item")}
+    chapters = []
+    for itemref in package.iter(f"{OPF_NS}itemref"):
+        item = manifest.get(itemref.get("idref"))
+        if item is None or itemref.get("linear") == "no" or "html" not in (item.get("media-type") or ""):
+            continue
+        href = unquote(item.get("href", "").partition("#")[0])
+        chapters.append(posixpath.normpath(posixpath.join(folder, href)))
+    return chapters
+
+
+# Yields (text, fraction of the book read) for each chapter of an EPUB.
+# A chapter is only decompressed and parsed when it is asked for
+def iter_epub_blocks(path):
+    try:
+        book = zipfile.ZipFile(path)
+    except zipfile.BadZipFile as error:
+        raise ValueError(f"not a valid EPUB: {error}") from error
+    with book:
+        names = set(book.namelist())
+        chapters = [name for name in epub_spine(book) if name in names]
+        sizes = [book.getinfo(name).file_size for name in chapters]
+        total = sum(sizes) or 1
+        done = 0
+        for name, size in zip(chapters, sizes):
+            text = html_text(book.read(name))
+            done += size
+            yield text, done / total
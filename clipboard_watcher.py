@@ -0,0 +1,94 @@
+import threading
+
+from document_cache import DocumentCache
+
+
+# Polls the clipboard on a background thread and prepares (normalizes and
+# tokenizes) new content as soon as it appears, so the hotkey can start
+# reading without pasting on the Tk thread. Polling backs off while the
+# clipboard is unchanged and snaps back to the fastest rate after a change;
+# changes are detected by hashing the content
+class ClipboardWatcher(threading.Thread):
+    def __init__(self, paste, prepare, min_interval=0.25, max_interval=2.0, backoff=1.5):
+        super().__init__(name="clipboard-watcher", daemon=True)
+        self.paste = paste  # Returns the clipboard text (blocking is fine here)
+        self.prepare = prepare  # Turns clipboard text into a prepared document
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopped = False
+        self.polling = False  # A poll is in progress
+        self.polls = 0  # Completed polls
+        self.pastes = 0  # Polls that have pasted the clipboard (the one in progress may have)
+        self.pasted = None  # (key, text) of the latest paste
+        self.document = None  # (key, text, prepared, error) of the latest clipboard content
+
+    def run(self):
+        interval = self.min_interval
+        while not self.stopped:
+            self.wake.clear()  # A request arriving from here on cuts the next wait short
+            changed = self.poll()
+            interval = self.min_interval if changed else min(interval * self.backoff, self.max_interval)
+            self.wake.wait(interval)
+
+    # Function to check the clipboard once, preparing it if it changed. If
+    # preparing fails (e.g. a worker process died or memory ran out), the
+    # document is kept unprepared with the error, so the poll still completes
+    # and whoever waits for it can prepare the text itself
+    def poll(self):
+        with self.lock:
+            self.polling = True
+        document = None
+        try:
+            try:
+                text = self.paste().strip()
+            except Exception:
+                text = ""  # Clipboard backends raise their own error types; treat as empty
+            key = DocumentCache.key_for(text)
+            with self.lock:
+                self.pasted = (key, text)
+                self.pastes += 1
+            if self.document is None or self.document[0] != key:
+                prepared = error = None
+                try:
+                    prepared = self.prepare(text) if text else None
+                except Exception as caught:
+                    error = caught
+                document = (key, text, prepared, error)
+        finally:
+            with self.lock:
+                if document is not None:
+                    self.document = document
+                self.polling = False
+                self.polls += 1
+                self.pastes = max(self.pastes, self.polls)
+        return document is not None
+
+    # Function to ask for an immediate poll; returns the poll count to wait for
+    def request_poll(self):
+        with self.lock:
+            target = self.polls + (2 if self.polling else 1)
+        self.wake.set()
+        return target
+
+    # Returns the latest document, (key, text, prepared, error), once `target`
+    # polls have completed, else None. `prepared` is None and `error` says why
+    # if the text could not be prepared. If the clipboard has been pasted but
+    # new text is still being prepared, it is returned unprepared (with no
+    # error) rather than waiting for that, which takes a while for long texts
+    def document_after(self, target):
+        with self.lock:
+            if self.polls >= target:
+                return self.document
+            if self.pastes >= target:
+                key, text = self.pasted
+                if self.document is not None and self.document[0] == key:
+                    return self.document
+                return key, text, None, None
+        return None
+
+    def stop(self):
+        self.stopped = True
+        self.wake.set()
@@ -0,0 +1,228 @@
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, chain, compress, islice, repeat
+from operator import add, methodcaller, sub
+
+
+# Closing quotes and brackets, which may follow a word's punctuation
+closers = "\"')]}\u201d\u2019\u00bb"
+
+# A word ends a sentence if it ends in . ! or ?, possibly followed by closing quotes or brackets
+sentence_end = re.compile("[.!?][" + re.escape(closers) + "]*$")
+
+
+# Offsets of every word in the normalized text, stored in flat arrays so
+# a lookup by word index is O(1) instead of re-summing word lengths. The
+# sentence and paragraph tables hold the index of the first word of each
+# sentence and paragraph, so the one around a word is found by bisection
+class WordIndex:
+    __slots__ = ("starts", "ends", "lines", "columns", "sentences", "paragraphs")
+
+    def __init__(self):
+        self.starts = array("I")  # Character offset where each word starts
+        self.ends = array("I")  # Character offset just past each word
+        self.lines = array("I")  # Tk line number (1-based) of each word
+        self.columns = array("I")  # Tk column of each word within its line
+        self.sentences = array("I")  # First word of each sentence
+        self.paragraphs = array("I")  # First word of each paragraph (line)
+
+    def __len__(self):
+        return len(self.starts)
+
+    # Function to append the words of another index (e.g. the next chunk)
+    def extend(self, other):
+        self.starts.extend(other.starts)
+        self.ends.extend(other.ends)
+        self.lines.extend(other.lines)
+        self.columns.extend(other.columns)
+        self.sentences.extend(other.sentences)
+        self.paragraphs.extend(other.paragraphs)
+
+    # Returns the Tk "line.column" start and end indices of a word
+    def tk_range(self, index):
+        line = self.lines[index]
+        column = self.columns[index]
+        length = self.ends[index] - self.starts[index]
+        return f"{line}.{column}", f"{line}.{column + length}"
+
+
+# The words of a document, stored as nothing more than the normalized text
+# and its WordIndex: a word's string is only sliced out of the text when it
+# is asked for (i.e. displayed), instead of holding one str object per word
+# next to the text. A lazily loaded document's index grows in place, and
+# so does this view of it
+class Words:
+    __slots__ = ("text", "word_index")
+
+    def __init__(self, text, word_index):
+        self.text = text
+        self.word_index = word_index
+
+    def __len__(self):
+        return len(self.word_index.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[word] for word in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self.text[self.word_index.starts[index]:self.word_index.ends[index]]
+
+    def __iter__(self):
+        return map(self.text.__getitem__, map(slice, self.word_index.starts, self.word_index.ends))
+
+    # Returns the words first..last (on one line) as they appear in the text
+    def span(self, first, last):
+        return self.text[self.word_index.starts[first]:self.word_index.ends[last]]
+
+
+# Returns the last boundary (a word index in the sorted table `starts`)
+# before `word`, or 0 if there is none
+def previous_boundary(starts, word):
+    position = bisect_left(starts, word)
+    return starts[position - 1] if position else 0
+
+
+# Returns the first boundary after `word`, or None if there is none
+def next_boundary(starts, word):
+    position = bisect_right(starts, word)
+    return starts[position] if position < len(starts) else None
+
+
+# Groups of consecutive words flashed together, stored as the first and
+# last word index of each chunk
+class ChunkIndex:
+    __slots__ = ("firsts", "lasts")
+
+    def __init__(self):
+        self.firsts = array("I")
+        self.lasts = array("I")
+
+    def __len__(self):
+        return len(self.firsts)
+
+    # Returns the number of the chunk that contains a word
+    def chunk_at(self, word):
+        return bisect_right(self.firsts, word) - 1
+
+
+# Function to split the words into display chunks of at most `max_words`
+# words and (if set) `max_chars` characters. Chunks never cross a paragraph
+# break, so each one is a single slice of one line of the normalized text
+def build_chunks(word_index, max_words, max_chars=0):
+    starts, ends, lines = word_index.starts, word_index.ends, word_index.lines
+    chunks = ChunkIndex()
+    total = len(word_index)
+    first = 0
+
+    for word in range(1, total):
+        if (word - first >= max_words
+                or lines[word] != lines[first]
+                or (max_chars and ends[word] - starts[first] > max_chars)):
+            chunks.firsts.append(first)
+            chunks.lasts.append(word - 1)
+            first = word
+
+    if total:
+        chunks.firsts.append(first)
+        chunks.lasts.append(total - 1)
+    return chunks
+
+
+CHUNK_SIZE = 1 << 20  # Raw characters normalized per batch
+
+
+# Yields (start, end) of line-aligned slices of a text from `start` (a line
+# start) on: each runs `chunk_size` characters, then on to the next newline,
+# which is left out. With `first_size`, the slices start at that size and
+# double up to `chunk_size`
+def iter_line_spans(text, chunk_size=CHUNK_SIZE, start=0, first_size=None):
+    length = len(text)
+    position = start
+    size = chunk_size if first_size is None else min(first_size, chunk_size)
+    while position < length:
+        end = text.find("\n", position + size)
+        if end == -1:
+            end = length
+        yield position, end
+        position = end + 1
+        size = min(size * 2, chunk_size)
+
+
+# Yields line-aligned slices of about `chunk_size` characters of a text
+# (without the newlines between them)
+def iter_line_blocks(text, chunk_size=CHUNK_SIZE):
+    for start, end in iter_line_spans(text, chunk_size):
+        yield text[start:end]
+
+
+# Normalizes text in line-aligned chunks, so every temporary copy is
+# bounded by the chunk size (see normalize_blocks)
+def iter_normalized_chunks(text, chunk_size=CHUNK_SIZE):
+    return normalize_blocks(iter_line_blocks(text, chunk_size))
+
+
+# Returns the normalized lines of a block of whole lines: each line is
+# stripped, runs of whitespace become one space and empty lines are dropped
+def normalize_lines(block):
+    lines = [" ".join(raw_line.split()) for raw_line in block.split("\n")]
+    return [text_line for text_line in lines if text_line]
+
+
+# Normalizes a stream of blocks of whole lines (see normalize_lines).
+# Yields, per block, the normalized piece (including the newline joining
+# it to the previous piece), its words and a WordIndex with their positions
+# in the whole normalized text. Per-word offsets are computed with C-level
+# accumulate/map rather than a Python loop over every word. A stream that
+# continues a text starts from that text's length, word and line counts
+def normalize_blocks(blocks, offset=0, word_offset=0, line=1):
+    # offset: length of the normalized text yielded so far
+    # word_offset: number of words yielded so far
+    # line: Tk line number of the next normalized line
+
+    for block in blocks:
+        lines = normalize_lines(block)
+        if not lines:
+            continue
+
+        first = offset + 1 if offset else 0  # Start of the first line in the normalized text
+        piece = "\n".join(lines)
+        if offset:
+            piece = "\n" + piece
+        words = piece.split()
+
+        chunk_index = WordIndex()
+        chunk_index.starts = array("I", islice(accumulate(map((1).__add__, map(len, words)), initial=first), len(words)))
+        chunk_index.ends = array("I", map(add, chunk_index.starts, map(len, words)))
+
+        # Words per line, then each word's line number and column relative to its line start
+        counts = list(map((1).__add__, map(methodcaller("count", " "), lines)))
+        line_starts = accumulate(map((1).__add__, map(len, lines)), initial=first)
+        chunk_index.lines = array("I", chain.from_iterable(map(repeat, range(line, line + len(lines)), counts)))
+        chunk_index.columns = array("I", map(sub, chunk_index.starts, chain.from_iterable(map(repeat, line_starts, counts))))
+        line += len(lines)
+
+        # Every paragraph starts a sentence; so does each word after a sentence end
+        # (a chunk's last word ends a line, so the next chunk starts a paragraph anyway)
+        chunk_index.paragraphs = array("I", islice(accumulate(counts, initial=word_offset), len(lines)))
+        after_ends = compress(range(word_offset + 1, word_offset + len(words)), map(sentence_end.search, words))
+        chunk_index.sentences = array("I", sorted(set(chain(chunk_index.paragraphs, after_ends))))
+        word_offset += len(words)
+
+        offset += len(piece)
+        yield piece, words, chunk_index
+
+
+# Function to normalize clipboard text and tokenize it in the same pass,
+# returning the normalized text, its Words and their WordIndex
+def prepare_text(raw):
+    pieces = []
+    word_index = WordIndex()
+
+    for piece, _, chunk_index in iter_normalized_chunks(raw):
+        pieces.append(piece)
+        word_index.extend(chunk_index)
+
+    text = "".join(pieces)
+    return text, Words(text, word_index), word_index
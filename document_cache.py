@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from array import array
+
+from document import WordIndex
+
+
+# Header of a cached document: magic, array item size, text bytes, word,
+# sentence and paragraph counts. The tables follow the text, then one
+# duration (a double) per word
+_header = struct.Struct("<6sBQQQQ")
+_magic = b"SPRD3\n"
+
+
+# On-disk cache of tokenized documents, keyed by a hash of the clipboard
+# text. Each entry holds the normalized text, its WordIndex tables and its
+# word durations (so a cached document needs no normalizing, tokenizing or
+# pacing) plus the last read position. When the cache grows past `max_bytes` the least recently used
+# entries are evicted. put() may run on a background thread (a large
+# document takes a while to write), so the index is only touched under a lock
+class DocumentCache:
+    def __init__(self, folder, max_bytes):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(folder, "index.json")
+        self.entries = self.load_index()  # key -> {"size", "position", "last_used"}
+        self.pending_positions = {}  # key -> position saved before the entry was put
+        self.lock = threading.RLock()
+
+    # Load the cache index, or start empty if it is missing or unreadable
+    def load_index(self):
+        try:
+            with open(self.index_path, "r") as file:
+                return json.load(file)
+        except (json.JSONDecodeError, IOError):
+            return {}
+
+    # Function to write the cache index atomically via temp file + rename
+    def save_index(self):
+        os.makedirs(self.folder, exist_ok=True)
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.entries, file)
+        os.replace(temp_path, self.index_path)
+
+    # Returns the cache key of a (raw) clipboard text
+    @staticmethod
+    def key_for(raw):
+        return hashlib.sha256(raw.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.folder, key + ".doc")
+
+    # Returns (text, word_index, durations, position) for a cached document, or None
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        try:
+            with open(self.path_for(key), "rb") as file:
+                magic, itemsize, text_size, words, sentences, paragraphs = _header.unpack(file.read(_header.size))
+                if magic != _magic or itemsize != array("I").itemsize:
+                    raise ValueError("incompatible cache entry")
+                text = file.read(text_size).decode("utf-8", "surrogatepass")
+                word_index = WordIndex()
+                for table in (word_index.starts, word_index.ends, word_index.lines, word_index.columns):
+                    table.fromfile(file, words)
+                word_index.sentences.fromfile(file, sentences)
+                word_index.paragraphs.fromfile(file, paragraphs)
+                durations = array("d")
+                durations.fromfile(file, words)
+        except (OSError, ValueError, EOFError, struct.error):
+            self.remove(key)
+            return None
+
+        with self.lock:
+            entry["last_used"] = time.time()
+            self.save_index()
+        return text, word_index, durations, entry["position"]
+
+    # Returns the last read position of a cached document (marking it as used), or None
+    def position_of(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        entry["last_used"] = time.time()
+        return entry["position"]
+
+    # Function to store a tokenized document and its word durations (see
+    # pacing.word_durations), evicting old entries to stay under the size cap.
+    # A position saved while it was still being written is kept
+    def put(self, key, text, word_index, durations):
+        encoded = text.encode("utf-8", "surrogatepass")
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self.path_for(key), "wb") as file:
+            file.write(_header.pack(_magic, array("I").itemsize, len(encoded), len(word_index),
+                                    len(word_index.sentences), len(word_index.paragraphs)))
+            file.write(encoded)
+            tables = (word_index.starts, word_index.ends, word_index.lines, word_index.columns,
+                      word_index.sentences, word_index.paragraphs)
+            for table in tables:
+                table.tofile(file)
+            durations.tofile(file)
+
+        with self.lock:
+            self.entries[key] = {
+                "size": (_header.size + len(encoded) + sum(map(len, tables)) * array("I").itemsize
+                         + len(durations) * durations.itemsize),
+                "position": self.pending_positions.pop(key, 0),
+                "last_used": time.time(),
+            }
+            self.evict(keep=key)
+            self.save_index()
+
+    # Function to remember where reading stopped in a cached document. For a
+    # document not in the cache yet (put() runs in the background, once the
+    # whole text is tokenized) the position is applied when it is put
+    def set_position(self, key, position):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.pending_positions[key] = position
+            elif entry["position"] != position:
+                entry["position"] = position
+                self.save_index()
+
+    # Function to drop least recently used entries until the cache fits its cap
+    def evict(self, keep=None):
+        total = sum(entry["size"] for entry in self.entries.values())
+        for key in sorted(self.entries, key=lambda key: self.entries[key]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                total -= self.entries[key]["size"]
+                self.remove(key, save=False)
+
+    def remove(self, key, save=True):
+        with self.lock:
+            self.entries.pop(key, None)
+            try:
+                os.remove(self.path_for(key))
+            except OSError:
+                pass
+            if save:
+                self.save_index()
@@ -0,0 +1,207 @@
+import time
+
+from document import WordIndex, Words, build_chunks, next_boundary, previous_boundary
+from pacing import DeadlineScheduler, FrameTimings, chunk_durations, word_durations
+
+
+# Returns (chunks, durations) for a prepared document: the ChunkIndex when
+# several words are flashed at once (else None) and the relative duration
+# of every word or chunk when timing is variable (else None). Word
+# durations computed earlier (e.g. cached) can be passed in
+def pacing_tables(text, word_index, chunk_words=1, chunk_max_chars=0, variable_timing=False, durations=None):
+    if not variable_timing:
+        durations = None
+    elif durations is None:
+        durations = word_durations(text, word_index)
+    chunks = None
+    if chunk_words > 1 or chunk_max_chars > 0:
+        chunks = build_chunks(word_index, max(1, chunk_words), chunk_max_chars)
+        if durations is not None:
+            durations = chunk_durations(durations, chunks)
+    return chunks, durations
+
+
+# Drives a reading session over an already tokenized document: it owns the
+# position, the pacing and the pending tick, and shows words through a
+# renderer (see renderers.py), whose event loop also runs the ticks. The
+# same engine therefore drives the Tk window, the terminal and benchmark
+# runs. Pausing, resuming and seeking only move the position and
+# (re)schedule a tick, so none of them re-paste, re-tokenize or reinsert
+# the document
+class ReadingEngine:
+    def __init__(self, renderer, on_tick=None, on_end=None, clock=time.perf_counter):
+        self.renderer = renderer
+        self.clock = clock  # Clock the pacing runs on
+        self.on_tick = on_tick  # Called after every shown word (or chunk)
+        self.on_end = on_end  # Called when a session ends, with its scheduler
+        self.words = []
+        self.word_index = None  # WordIndex of the words, for sentence and paragraph seeks
+        self.chunks = None  # ChunkIndex when several words are shown at once
+        self.durations = None  # Relative duration of every word (or chunk)
+        self.lazy = None  # LazyDocument the tables belong to, if it is still loading
+        self.index = 0  # Next word to show
+        self.current = None  # First word of the word (or chunk) shown last
+        self.speed = 1.0
+        self.scheduler = None  # Paces the running session
+        self.timings = None  # Frame timings of the running (or last) session
+        self.job = None  # Pending renderer timer of the next tick
+
+    # Function to switch to a new document, starting at word `position`.
+    # With `lazy`, the tables grow as reading gets close to their end
+    def load(self, text, words, word_index, chunks=None, durations=None, position=0, lazy=None):
+        self.pause()
+        if self.lazy is not None and self.lazy is not lazy:
+            self.lazy.close()
+        self.lazy = lazy
+        self.renderer.load(text, word_index)
+        self.words = words
+        self.word_index = word_index
+        self.current = None
+        self.chunks = chunks
+        self.durations = durations
+        self.index = position if 0 <= position < len(words) else 0
+
+    # Function to forget the document and clear the renderer
+    def unload(self):
+        self.load("", Words("", WordIndex()), None)
+        self.renderer.clear()
+
+    @property
+    def running(self):
+        return self.scheduler is not None
+
+    # Function to start (or continue) reading from the current position
+    def resume(self, speed=None):
+        if self.running or not self.words:
+            return
+        if speed is not None:
+            self.speed = speed
+        self.scheduler = DeadlineScheduler(self.speed, self.clock)
+        self.timings = FrameTimings()
+        self.scheduler.start()
+        self.tick()
+
+    # Function to stop reading, keeping the position to resume from
+    def pause(self):
+        if self.job is not None:
+            self.renderer.cancel(self.job)
+            self.job = None
+        if self.scheduler is not None:
+            scheduler, self.scheduler = self.scheduler, None
+            if self.on_end is not None:
+                self.on_end(scheduler)
+
+    # Function to jump to a word. A running session shows it right away and
+    # continues from there; a paused one just shows it
+    def seek(self, index):
+        if not self.words:
+            return
+        if self.lazy is not None:
+            self.lazy.ensure(index)
+        index = min(max(index, 0), len(self.words) - 1)
+        if self.chunks is not None:
+            index = self.chunks.firsts[self.chunks.chunk_at(index)]
+        self.index = index
+        if self.running:
+            if self.job is not None:
+                self.renderer.cancel(self.job)
+                self.job = None
+            self.scheduler.next_deadline = self.scheduler.clock()
+            self.tick()
+        else:
+            self.show(*self.unit_at(index)[1:])
+
+    # Function to jump to the start of the previous (or, going forward, the
+    # next) boundary in `starts`: the start of the sentence or paragraph being
+    # read if it is past its first word, otherwise the one before it
+    def seek_boundary(self, starts, forward=False):
+        if not self.words:
+            return
+        word = self.index if self.current is None else self.current
+        target = next_boundary(starts, word) if forward else previous_boundary(starts, word)
+        if target is not None:
+            self.seek(target)
+
+    def seek_sentence(self, forward=False):
+        if self.word_index is not None:
+            self.seek_boundary(self.word_index.sentences, forward)
+
+    def seek_paragraph(self, forward=False):
+        if self.word_index is not None:
+            self.seek_boundary(self.word_index.paragraphs, forward)
+
+    # Function to jump to a fraction (0.0 to 1.0) of the document. A lazy
+    # document may start over at that point rather than tokenize everything
+    # up to it, in which case its new tables replace the old ones
+    def seek_fraction(self, fraction):
+        lazy = self.lazy
+        if lazy is None:
+            self.seek(round(fraction * (len(self.words) - 1)))
+        elif lazy.reopen_at(fraction):
+            lazy.ensure(0)
+            self.renderer.load(lazy.text, lazy.word_index)
+            self.words = lazy.words
+            self.word_index = lazy.word_index
+            self.chunks = lazy.chunks
+            self.durations = lazy.durations
+            self.current = None
+            self.index = 0
+            self.seek(0)
+        else:
+            self.seek(lazy.word_at(fraction))
+
+    # Returns the fraction of the document read so far
+    def progress(self):
+        if self.lazy is not None:
+            return self.lazy.progress(self.index)
+        return self.index / len(self.words) if self.words else 0.0
+
+    # Function to change the speed, from the next word on if a session is running
+    def set_speed(self, speed):
+        self.speed = speed
+        if self.job is not None and speed != self.scheduler.speed:
+            self.scheduler.set_speed(speed)
+            self.schedule(self.scheduler.delay())
+
+    # Returns (unit, first, last): the chunk (or word) containing a word and its words
+    def unit_at(self, index):
+        if self.chunks is not None:
+            unit = self.chunks.chunk_at(index)
+            return unit, self.chunks.firsts[unit], self.chunks.lasts[unit]
+        return index, index, index
+
+    # Function to show the words first..last
+    def show(self, first, last):
+        self.current = first
+        self.renderer.show(self.words.span(first, last), first, last)
+
+    # Function to show the current word (or chunk) and schedule the next tick
+    def tick(self):
+        self.job = None
+        if self.lazy is not None:
+            self.lazy.ensure(self.index)
+        if self.index >= len(self.words):
+            self.index = 0
+            self.pause()
+            return
+
+        unit, first, last = self.unit_at(self.index)
+        scheduler = self.scheduler
+        shown = self.clock()
+        self.show(first, last)
+        self.timings.record(scheduler.next_deadline - scheduler.start_time, shown - scheduler.start_time,
+                            self.clock() - shown)
+
+        # Each word (or chunk) gets its precomputed share of the 1/speed cadence
+        duration = self.durations[unit] if self.durations else 1.0
+        self.index = last + 1
+        if self.on_tick is not None:
+            self.on_tick()
+        if self.scheduler is scheduler:  # on_tick may have paused or restarted the session
+            self.schedule(scheduler.advance(duration, last - first + 1))
+
+    # Function to (re)schedule the next tick after `delay` seconds
+    def schedule(self, delay):
+        if self.job is not None:
+            self.renderer.cancel(self.job)
+        self.job = self.renderer.after(delay, self.tick)
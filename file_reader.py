@@ -0,0 +1,55 @@
+import codecs
+import mmap
+import os
+
+BLOCK_SIZE = 1 << 16  # Bytes decoded per block (a block runs on to the next line end)
+MAX_LINE = 1 << 20  # Past this, a block without a line end is cut at a space instead
+
+
+# Yields (text, fraction of the file read) for line-aligned blocks of a
+# UTF-8 text file. The file is memory-mapped, so only the block being
+# decoded is ever copied; the rest stays in the OS page cache. Reading can
+# start part way in, at the first line that starts at or after `start` (a
+# fraction of the file), without touching anything before it
+def iter_file_blocks(path, block_size=BLOCK_SIZE, start=0.0):
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if not size:
+            return  # Empty files can't be mapped
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = len(codecs.BOM_UTF8) if mapped[:3] == codecs.BOM_UTF8 else 0
+            offset = int(start * size)
+            if offset > position:
+                position = start_position(mapped, offset, size)
+            while position < size:
+                end = mapped.find(b"\n", position + block_size, position + block_size + MAX_LINE)
+                skip = 1  # Drop the newline between blocks
+                if end == -1 and position + block_size + MAX_LINE < size:
+                    end = mapped.rfind(b" ", position, position + block_size)
+                    if end == -1:
+                        # No whitespace at all: cut at a character boundary
+                        end = position + block_size
+                        while mapped[end] & 0xC0 == 0x80:
+                            end -= 1
+                        skip = 0
+                elif end == -1:
+                    end = size
+                yield mapped[position:end].decode("utf-8", "replace"), end / size
+                position = end + skip
+
+
+# Returns where reading from byte `offset` on should start: the first line
+# start at or after it, or (in a line too long to look for its end) the
+# next word, or else the next character
+def start_position(mapped, offset, size):
+    line_end = mapped.find(b"\n", offset - 1, offset + MAX_LINE)
+    if line_end != -1:
+        return line_end + 1
+    if offset + MAX_LINE >= size:
+        return size
+    space = mapped.find(b" ", offset - 1, offset + MAX_LINE)
+    if space != -1:
+        return space + 1
+    while mapped[offset] & 0xC0 == 0x80:
+        offset += 1
+    return offset
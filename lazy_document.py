@@ -0,0 +1,244 @@
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+from operator import add
+
+from document import ChunkIndex, WordIndex, Words, build_chunks, normalize_blocks
+from pacing import chunk_durations, word_durations
+
+
+# The normalized text of a lazily loaded document, kept as the pieces
+# loaded so far; a slice only joins the pieces it touches
+class PieceText:
+    def __init__(self):
+        self.pieces = []
+        self.starts = array("I")  # Offset of each piece in the normalized text
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        return "".join(self.pieces)
+
+    def append(self, piece):
+        self.starts.append(self.length)
+        self.pieces.append(piece)
+        self.length += len(piece)
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            piece = bisect_right(self.starts, key) - 1
+            return self.pieces[piece][key - self.starts[piece]]
+
+        start, stop, _ = key.indices(self.length)
+        if start >= stop:
+            return ""
+        first = bisect_right(self.starts, start) - 1
+        last = bisect_right(self.starts, stop - 1) - 1
+        if first == last:
+            return self.pieces[first][start - self.starts[first]:stop - self.starts[first]]
+        parts = [self.pieces[first][start - self.starts[first]:]]
+        parts.extend(self.pieces[first + 1:last])
+        parts.append(self.pieces[last][:stop - self.starts[last]])
+        return "".join(parts)
+
+
+# Normalizes and tokenizes a stream of (text of whole lines, fraction of
+# the source read after it) blocks, yielding (piece, WordIndex, fraction)
+# for every block that has any words (see normalize_blocks)
+def tokenize_blocks(blocks):
+    fraction = [0.0]
+
+    def texts():
+        for text, fraction[0] in blocks:
+            yield text
+
+    try:
+        for piece, _, piece_index in normalize_blocks(texts()):
+            yield piece, piece_index, fraction[0]
+    finally:
+        if hasattr(blocks, "close"):
+            blocks.close()  # E.g. unmap the file
+
+
+# Adds the pacing tables to a stream of tokenized pieces (see
+# tokenize_blocks), yielding (piece, WordIndex, chunks, durations,
+# fraction). The chunks are numbered in the whole document, so the reader
+# only has to append them; chunks and durations are None when not used
+def pace_pieces(pieces, chunk_words=1, chunk_max_chars=0, variable_timing=False):
+    chunked = chunk_words > 1 or chunk_max_chars > 0
+    offset = 0  # Characters before the piece
+    first_word = 0  # Words before the piece
+    for piece, piece_index, fraction in pieces:
+        durations = word_durations(piece, piece_index, offset) if variable_timing else None
+        chunks = None
+        # Chunks never cross a line and blocks end at a line end, so chunking block by block changes nothing
+        if chunked:
+            chunks = build_chunks(piece_index, max(1, chunk_words), chunk_max_chars)
+            if durations is not None:
+                durations = chunk_durations(durations, chunks)
+            if first_word:
+                chunks.firsts = array("I", map(add, chunks.firsts, repeat(first_word)))
+                chunks.lasts = array("I", map(add, chunks.lasts, repeat(first_word)))
+        offset += len(piece)
+        first_word += len(piece_index)
+        yield piece, piece_index, chunks, durations, fraction
+
+
+# A document whose tokenized pieces are pulled in one at a time as reading
+# gets close to the end of what has been loaded, so starting to read costs
+# one piece however long the source is. `pieces` yields what
+# tokenize_blocks yields; with `blocks_ahead`, that many whole blocks (e.g.
+# chapters) are kept loaded past the one being read. With `background`,
+# the pieces are tokenized and paced on a BackgroundTokenizer thread, and
+# each ensure() also takes one piece that is ready, if any, so the document
+# keeps up with the producer without a tick ever waiting on more than one
+# piece. The words, offsets, chunks and durations grow in place, so the
+# engine and the text view see new words without being reloaded. If the
+# source allows random access, `reopen(fraction)` returns its tokenized
+# pieces from that fraction on, and seeking far away starts the document
+# over there (see reopen_at) instead of tokenizing everything in between
+class LazyDocument:
+    lookahead = 2000  # Words kept tokenized past the reading position
+    reopen_blocks = 8  # Blocks past the loaded ones a seek may read up to before reopening instead
+
+    def __init__(self, pieces, chunk_words=1, chunk_max_chars=0, variable_timing=False, blocks_ahead=0,
+                 background=False, reopen=None):
+        self.blocks_ahead = blocks_ahead
+        self.chunk_words = max(1, chunk_words)
+        self.chunk_max_chars = chunk_max_chars
+        self.variable_timing = variable_timing
+        self.background = background
+        self.reopen = reopen
+        self.on_finished = None  # Called once the whole source has been loaded
+        self.start(pieces)
+
+    # Function to (re)start the document with empty tables on the tokenized
+    # `pieces` of the source from `fraction` on
+    def start(self, pieces, fraction=0.0):
+        self.text = PieceText()
+        self.word_index = WordIndex()
+        self.words = Words(self.text, self.word_index)
+        self.chunks = ChunkIndex() if self.chunk_words > 1 or self.chunk_max_chars > 0 else None
+        self.durations = array("d") if self.variable_timing else None
+        self.loaded_words = array("I")  # Words loaded after each block
+        self.loaded_fractions = array("d")  # Fraction of the source read after each block
+        self.start_fraction = fraction  # Fraction of the source before the first word
+        self.fraction = fraction  # Fraction of the source read so far
+        self.finished = False
+        self.pieces = self.paced(pieces)
+
+    # Returns the stream of paced pieces for tokenized `pieces`, running it
+    # on a background thread if the document was asked to
+    def paced(self, pieces):
+        paced = pace_pieces(pieces, self.chunk_words, self.chunk_max_chars, self.variable_timing)
+        if self.background:
+            from pipeline import BackgroundTokenizer
+            return BackgroundTokenizer(paced)
+        return paced
+
+    # Function to load the next piece; returns False at the end of the source
+    def load_next(self):
+        loaded = next(self.pieces, None)
+        if loaded is None:
+            self.finished = True
+            self.fraction = 1.0
+            self.close()
+            if self.on_finished is not None:
+                self.on_finished()
+            return False
+
+        piece, piece_index, chunks, durations, self.fraction = loaded
+        self.text.append(piece)
+        self.word_index.extend(piece_index)
+        if chunks is not None:
+            self.chunks.firsts.extend(chunks.firsts)
+            self.chunks.lasts.extend(chunks.lasts)
+        if durations is not None:
+            self.durations.extend(durations)
+        self.loaded_words.append(len(self.words))
+        self.loaded_fractions.append(self.fraction)
+        return True
+
+    # Function to load blocks until `word` plus the lookahead (in words and
+    # in blocks) is tokenized, or the source ends
+    def ensure(self, word):
+        while not self.finished and (
+                len(self.words) <= word + self.lookahead
+                or len(self.loaded_words) - bisect_right(self.loaded_words, word) <= self.blocks_ahead):
+            self.load_next()
+        ready = getattr(self.pieces, "ready", None)
+        if ready is not None and not self.finished and ready():
+            self.load_next()
+
+    # Returns the fraction of the source before a (loaded) word
+    def progress(self, word):
+        block = bisect_right(self.loaded_words, word)
+        if block == len(self.loaded_words):
+            return self.fraction
+        first = self.loaded_words[block - 1] if block else 0
+        start = self.loaded_fractions[block - 1] if block else self.start_fraction
+        share = (word - first) / (self.loaded_words[block] - first)
+        return start + share * (self.loaded_fractions[block] - start)
+
+    # Returns the word at a fraction of the source, loading blocks up to it
+    def word_at(self, fraction):
+        while not self.finished and self.fraction < fraction:
+            self.load_next()
+        block = min(bisect_left(self.loaded_fractions, fraction), len(self.loaded_fractions) - 1)
+        if block < 0:
+            return 0
+        first = self.loaded_words[block - 1] if block else 0
+        start = self.loaded_fractions[block - 1] if block else self.start_fraction
+        span = self.loaded_fractions[block] - start
+        share = (fraction - start) / span if span > 0 else 0.0
+        return first + int(min(max(share, 0.0), 1.0) * (self.loaded_words[block] - first))
+
+    # Function to start the document over at a fraction of the source, if the
+    # source can be reopened there and the fraction is before the first
+    # loaded word or more than reopen_blocks blocks past the last one (going
+    # by their average size). Returns True if it did: the words then start
+    # at the first line from there, in new tables
+    def reopen_at(self, fraction):
+        if self.reopen is None:
+            return False
+        if fraction >= self.start_fraction:
+            if self.finished or fraction <= self.fraction:
+                return False
+            loaded = self.fraction - self.start_fraction
+            if loaded > 0 and fraction - self.fraction <= loaded / len(self.loaded_fractions) * self.reopen_blocks:
+                return False
+        self.close()
+        self.start(self.reopen(fraction), fraction)
+        return True
+
+    # Function to release the source (e.g. unmap the file)
+    def close(self):
+        self.pieces.close()
+
+
+# Returns a LazyDocument for a file, picking the reader by its extension:
+# EPUBs are read a chapter at a time (keeping one chapter ahead), HTML files
+# are parsed as they are read and anything else is memory-mapped as UTF-8
+# text. The blocks are read, tokenized and paced on a background thread, so
+# a chapter boundary never stalls a tick
+def open_document(path, chunk_words=1, chunk_max_chars=0, variable_timing=False):
+    # The readers (zipfile, html.parser, xml.etree, mmap) are only imported
+    # once a file is opened, so they stay off the startup path
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".epub":
+        from book_reader import iter_epub_blocks
+        blocks, blocks_ahead = iter_epub_blocks(path), 1
+    elif extension in (".html", ".htm", ".xhtml"):
+        from book_reader import iter_html_blocks
+        blocks, blocks_ahead = iter_html_blocks(path), 0
+    else:
+        from file_reader import iter_file_blocks
+        # The file is mapped, so a seek can start reading anywhere in it
+        return LazyDocument(tokenize_blocks(iter_file_blocks(path)), chunk_words, chunk_max_chars, variable_timing,
+                            background=True,
+                            reopen=lambda fraction: tokenize_blocks(iter_file_blocks(path, start=fraction)))
+    return LazyDocument(tokenize_blocks(blocks), chunk_words, chunk_max_chars, variable_timing, blocks_ahead,
+                        background=True)
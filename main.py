@@ -1,151 +1,409 @@
-import pyperclip
 import time
+startup_time = time.perf_counter()  # Taken before anything else is imported
+import sys
 import tkinter as tk
 from tkinter import ttk
-from tkinter import colorchooser
-import threading
-import keyboard
-import json
+import_tk_time = time.perf_counter()
+import atexit
 import os
+import threading
+from document import Words, prepare_text
+from document_cache import DocumentCache
+from engine import ReadingEngine, pacing_tables
+from lazy_document import LazyDocument, open_document, tokenize_blocks
+from pacing import word_durations
+from pipeline import iter_text_blocks
+from renderers import TkRenderer
+from settings_store import SettingsStore
+from text_view import FullTextView, VirtualTextView
+from word_view import WordCanvas
+import_app_time = time.perf_counter()
+# The clipboard backend (pyperclip) and watcher, the keyboard hook and the
+# color chooser are imported on first use, after the window is already on screen
 
 
 # Default settings
 default_settings = {
     "highlight_color": "#AD0321",
-    "speed": 4.70
+    "speed": 4.70,
+    "variable_timing": True,  # Longer words, punctuation and paragraph ends get more time
+    "chunk_words": 1,  # Words flashed at once (1 = one word at a time)
+    "chunk_max_chars": 0,  # Maximum characters per flash in chunk mode (0 = no limit)
+    "timing_overlay": False,  # Show p50/p99 lateness while reading (toggle with F2)
+    "timing_export": "",  # "csv" or "json" to save each session's timings to timings_folder
+    "cache_max_mb": 200,  # Size cap of the tokenized document cache
+    "watch_clipboard": False,  # Prepare copied text in the background instead of pasting on the hotkey
+    "parallel_tokenize_mb": 32,  # Texts at least this large are tokenized across processes (0 = never)
+    "tokenize_workers": 0,  # Worker processes for that (0 = one per CPU core)
+    "full_text_view": False  # Show the whole document in the text box instead of the paragraphs around the word
 }
 
 # Path to config file
 config_path = "config.json"
 
-# Initialize global variables
-label = None 
+# Folder that exported session timings are written to
+timings_folder = "timings"
 
-stop_event = threading.Event()  # Global stop event
-current_index = 0  # Tracks the current word index
+# Folder of the tokenized document cache
+cache_folder = "cache"
+
+# Initialize global variables
+settings = None
+document_cache = None
+clipboard_watcher = None
+current_document_key = None  # Cache key of the document being read
+word_view = None 
+text_view = None
+timing_overlay = None
+
+pause_button = None
+progress_var = None  # Position in the document, in percent
+progress_dragging = False  # The progress bar is held, so reading must not move it
+
+engine = None  # Reveals the current document and tracks the position in it
 stop_button_press_count = 0  # Tracks stop button presses
-current_thread = None  # Track the current thread
 last_speed = default_settings["speed"]  # Track the last used speed
-
-# Load settings from config.json or use defaults
-def load_settings():
-    if os.path.exists(config_path):
+highlight_color = default_settings["highlight_color"]
+startup_phases = []  # (phase, seconds, end time) recorded for --profile-startup
+
+# Function to record how long a startup phase took (by default from the
+# end of the previous phase until now)
+def mark_startup_phase(name, start=None, end=None):
+    if end is None:
+        end = time.perf_counter()
+    if start is None:
+        start = startup_phases[-1][2] if startup_phases else startup_time
+    startup_phases.append((name, end - start, end))
+
+# Function to print the per-phase startup breakdown (to a file when a
+# windowed build has no console to print to)
+def print_startup_profile():
+    lines = [f"{name:<32}{seconds * 1000:8.1f} ms" for name, seconds, _ in startup_phases]
+    lines.append(f"{'total':<32}{sum(seconds for _, seconds, _ in startup_phases) * 1000:8.1f} ms")
+    report = "\n".join(lines)
+    if sys.stdout is not None:
+        print(report)
+    else:
+        with open("startup_profile.txt", "w") as file:
+            file.write(report + "\n")
+
+# Function to report a finished (or paused) session: achieved vs. target
+# speed, the timing overlay and export, and the position to resume from
+def end_reveal_session(scheduler, stats_label):
+    stats_label.config(text=scheduler.summary())
+    update_timing_overlay()
+    export_frame_timings()
+    save_reading_position()
+    pause_button.config(text="Resume" if engine.words else "Pause")
+
+# Function to refresh the overlay and the progress bar every few words
+def on_reveal_tick():
+    if engine.timings.count % 10 == 0:
+        update_timing_overlay()
+        show_progress()
+
+# Function to move the progress bar to the reading position, unless it is being dragged
+def show_progress():
+    if not progress_dragging:
+        progress_var.set(engine.progress() * 100)
+
+# Function to remember where reading stopped in the current document
+def save_reading_position():
+    if current_document_key is not None:
         try:
-            with open(config_path, "r") as file:
-                return json.load(file)
-        except (json.JSONDecodeError, IOError):
-            pass  # Fall back to default settings if there's an error
-    return default_settings
-
-# Save settings to config.json
-def save_settings(settings):
-    with open(config_path, "w") as file:
-        json.dump(settings, file)
-
-# Load the initial settings
-settings = load_settings()
-highlight_color = settings.get("highlight_color", default_settings["highlight_color"])
-default_speed = settings.get("speed", default_settings["speed"])
-
-# Function to replace new lines with a forward slash
-def process_text(text):
-    text = '\n'.join([' '.join(line.strip().split()) for line in text.split('\n') if line.strip()])
-    text = text.replace("\n", "\n")
-    return text
-
-# Function to reveal text word by word
-def reveal_text(words, speed, label, text_widget):
-    global current_index
-    num_words = len(words)
-
-    while current_index < num_words:
-        if stop_event.is_set():  # Check if the thread should stop
-            return
-
-        word = words[current_index]
-        label.config(text=word)
-        highlight_word_by_index(current_index, words, text_widget)
-
-        current_index += 1
-        time.sleep(1 / speed)
-
-    current_index = 0
-
-# Function to highlight the word in the text widget by index
-def highlight_word_by_index(index, words, text_widget):
-    pos = 0
-
-    for i in range(index):
-        pos += len(words[i])
-        if words[i] != "\n":
-            pos += 1
-
-    start_idx = f"1.0 + {pos}c"
-    end_idx = f"{start_idx} + {len(words[index])}c"
-
-    text_widget.tag_remove("highlight", "1.0", "end")
-    text_widget.tag_add("highlight", start_idx, end_idx)
-    text_widget.tag_configure("highlight", foreground=highlight_color)
-    text_widget.see(start_idx)
+            document_cache.set_position(current_document_key, engine.index)
+        except OSError:
+            pass  # The cache is only an optimization
+
+# Function to show the session's p50/p99 lateness in the overlay (if enabled)
+def update_timing_overlay():
+    if not settings["timing_overlay"] or engine.timings is None:
+        return
+    p50, p99 = engine.timings.lateness_percentiles(0.5, 0.99)
+    timing_overlay.config(text=f"late p50 {p50 * 1000:.1f} ms / p99 {p99 * 1000:.1f} ms")
+
+# Function to show or hide the timing overlay
+def toggle_timing_overlay():
+    settings["timing_overlay"] = not settings["timing_overlay"]
+    if settings["timing_overlay"]:
+        # Placed rather than packed, so showing it never relayouts the window
+        timing_overlay.place(x=4, y=2)
+        update_timing_overlay()
+    else:
+        timing_overlay.place_forget()
+
+# Function to save the finished session's timings as CSV or JSON (if enabled)
+def export_frame_timings():
+    export_format = settings["timing_export"]
+    if export_format not in ("csv", "json") or not engine.timings:
+        return
+    os.makedirs(timings_folder, exist_ok=True)
+    path = os.path.join(timings_folder, time.strftime(f"session-%Y%m%d-%H%M%S.{export_format}"))
+    engine.timings.export(path)
+
+# Returns the speed label's text. In chunk mode the slider sets flashes (of
+# several words) per second, not words per second
+def speed_text(speed):
+    unit = "flash" if settings["chunk_words"] > 1 or settings["chunk_max_chars"] > 0 else "word"
+    units = "flashes" if unit == "flash" else "words"
+    return f"{speed:.2f} {units} per second / {1 / speed:.2f} seconds per {unit}"
 
 # Function to update the current speed label
 def update_speed_label(speed_var, speed_label):
     speed = speed_var.get()
-    seconds_per_word = 1 / speed
-    speed_label.config(text=f"{speed:.2f} words per second / {seconds_per_word:.2f} seconds per word")
+    speed_label.config(text=speed_text(speed))
     settings["speed"] = speed
-    save_settings(settings)
+
+    # Apply the new speed to a running session from the next word on
+    engine.set_speed(speed)
 
 # Function to start the reveal process
-def start_reveal_process(label, speed_var, root, text_widget, speed_label):
-    global stop_event, stop_button_press_count, current_index, current_thread, last_speed
+def start_reveal_process(word_view, speed_var, root, text_view, speed_label, stats_label):
+    global stop_button_press_count
     
     stop_button_press_count = 0
+
+    # Ensure the previous session has finished before loading a new one
+    if engine.running:
+        return  # Do nothing if a session is already running
+
+    # With the watcher running, ask it for a fresh look at the clipboard and
+    # start from the document it has already prepared
+    if clipboard_watcher is not None:
+        target = clipboard_watcher.request_poll()
+        wait_for_clipboard(target, word_view, speed_var, root, text_view, speed_label, stats_label)
+        return
+
+    import pyperclip
     text = pyperclip.paste().strip()
+    start_reading(text, None, None, word_view, speed_var, root, text_view, speed_label, stats_label)
+
+# Function to start reading once the watcher has polled the clipboard,
+# checking back on the Tk event loop instead of blocking it
+def wait_for_clipboard(target, word_view, speed_var, root, text_view, speed_label, stats_label):
+    document = clipboard_watcher.document_after(target)
+    if document is None and clipboard_watcher.is_alive():
+        root.after(5, wait_for_clipboard, target, word_view, speed_var, root, text_view, speed_label, stats_label)
+        return
+    if document is None:
+        # The watcher is gone: paste on the hotkey as if it had never run
+        import pyperclip
+        document = (None, pyperclip.paste().strip(), None, None)
+    # If the watcher failed to prepare the text, or is still preparing it,
+    # prepared is None and it is tokenized here instead (see start_reading)
+    key, text, prepared, _ = document
+    start_reading(text, key, prepared, word_view, speed_var, root, text_view, speed_label, stats_label)
+
+# Function to load the clipboard text (prepared already if `prepared` is
+# given) and start revealing it
+def start_reading(text, key, prepared, word_view, speed_var, root, text_view, speed_label, stats_label):
+    global last_speed
+    if engine.running:
+        return  # A session started while we waited for the watcher
     if not text:
-        label.config(text="No text found in clipboard!")
+        word_view.show_message("No text found in clipboard!")
         return
 
-    text = process_text(text)
-    text_widget.delete(1.0, "end")
-    text_widget.insert("1.0", text)
+    # The same document as last time is still loaded: just carry on reading it
+    key = key or DocumentCache.key_for(text)
+    if key == current_document_key and engine.words:
+        last_speed = speed_var.get()
+        engine.resume(last_speed)
+        pause_button.config(text="Pause")
+        bring_window_to_front(root)
+        update_speed_label(speed_var, speed_label)
+        return
 
-    label.config(text="")
+    loaded = load_document(text, key, prepared)
+    word_view.clear()
     speed = speed_var.get()
-
-    # Ensure the previous thread has completed or text_widget is empty before starting new thread
-    if current_thread is not None and current_thread.is_alive():
-        return  # Do nothing if a thread is already running
     
     last_speed = speed  # Update the last used speed
-    if stop_event is not None and stop_event.is_set():
-        stop_event.clear()
+    if loaded is None:
+        document = open_clipboard_document(text)
+        engine.load(document.text, document.words, document.word_index, document.chunks, document.durations,
+                    0, document)
+    else:
+        text, words, word_index, durations, position = loaded
+        chunks, durations = pacing_tables(text, word_index, settings["chunk_words"], settings["chunk_max_chars"],
+                                          settings["variable_timing"], durations)
+        engine.load(text, words, word_index, chunks, durations, position)
+    engine.resume(last_speed)
+    pause_button.config(text="Pause")
+
+    bring_window_to_front(root)
+    update_speed_label(speed_var, speed_label)
+
+# Function to pick a text file and start reading it
+def open_file_dialog(word_view, speed_var, root, text_view, speed_label, stats_label):
+    from tkinter import filedialog
+    path = filedialog.askopenfilename(filetypes=[
+        ("Text, EPUB and HTML files", "*.txt *.log *.md *.epub *.html *.htm *.xhtml"),
+        ("All files", "*.*"),
+    ])
+    if path:
+        start_reading_file(path, word_view, speed_var, root, text_view, speed_label, stats_label)
+
+# Function to start reading a file. It is tokenized a block at a time just
+# ahead of the reading position, so even a huge file starts at once and
+# never goes through the clipboard
+def start_reading_file(path, word_view, speed_var, root, text_view, speed_label, stats_label):
+    global current_document_key, last_speed, stop_button_press_count
+    stop_button_press_count = 0
+    engine.pause()
 
-    stop_event = threading.Event()
-    words = text.split()
-    current_thread = threading.Thread(target=reveal_text, args=(words, last_speed, label, text_widget), daemon=True)
-    current_thread.start()
+    document = open_document(path, settings["chunk_words"], settings["chunk_max_chars"], settings["variable_timing"])
+    try:
+        document.ensure(0)
+    except (OSError, ValueError):
+        word_view.show_message("Could not open the file!")
+        return
+    if not document.words:
+        word_view.show_message("No text found in file!")
+        return
+
+    current_document_key = None  # Files are read in place, so they are not cached
+    word_view.clear()
+    last_speed = speed_var.get()
+    engine.load(document.text, document.words, document.word_index, document.chunks, document.durations, 0, document)
+    engine.resume(last_speed)
+    pause_button.config(text="Pause")
 
     bring_window_to_front(root)
     update_speed_label(speed_var, speed_label)
 
+# Function to load a document, with its word durations, from the cache
+# (resuming where it was left). A document the clipboard watcher already
+# prepared is used as is and added to the cache; on a miss, returns None
+# (see open_clipboard_document)
+def load_document(raw, key=None, prepared=None):
+    global current_document_key
+    current_document_key = key or DocumentCache.key_for(raw)
+    position = document_cache.position_of(current_document_key)
+
+    if prepared is None and position is not None:
+        cached = document_cache.get(current_document_key)
+        if cached is not None:
+            text, word_index, durations, position = cached
+            prepared = (text, Words(text, word_index), word_index, durations)
+        else:
+            position = None  # The entry was unreadable and has been dropped
+    if prepared is None:
+        return None
+    text, words, word_index, durations = prepared
+
+    if position is None:
+        position = 0
+        cache_in_background(current_document_key, text, word_index, durations)
+
+    return text, words, word_index, durations, position
+
+# Function to add a document to the cache on a background thread, since
+# writing a large one takes a while. Its word durations are computed there
+# if they are not given
+def cache_in_background(key, text, word_index, durations=None):
+    def write():
+        joined = str(text)  # Joins the pieces of a LazyDocument's text
+        try:
+            document_cache.put(key, joined, word_index,
+                               word_durations(joined, word_index) if durations is None else durations)
+        except OSError:
+            pass  # The cache is only an optimization
+
+    threading.Thread(target=write, daemon=True).start()
+
+# Returns the worker processes to tokenize clipboard text across, or 0 if it
+# is below "parallel_tokenize_mb" (or only one worker is available)
+def parallel_workers(raw):
+    threshold = settings["parallel_tokenize_mb"] * 1024 * 1024
+    workers = settings["tokenize_workers"] or os.cpu_count() or 1
+    return workers if threshold and len(raw) >= threshold and workers > 1 else 0
+
+# Function to start tokenizing clipboard text on a background thread and
+# return it as a LazyDocument holding at least the first words, so reading
+# starts at once however long the text is. Texts large enough for it are
+# tokenized across a process pool behind that thread. Once the whole text
+# has been tokenized it is added to the cache, also in the background
+def open_clipboard_document(raw):
+    workers = parallel_workers(raw)
+    if workers:
+        from parallel_tokenize import iter_pieces_parallel
+        pieces = iter_pieces_parallel(raw, workers)
+    else:
+        pieces = tokenize_blocks(iter_text_blocks(raw))
+    document = LazyDocument(pieces, settings["chunk_words"], settings["chunk_max_chars"], settings["variable_timing"],
+                            background=True)
+    key = current_document_key
+    if key is not None:
+        document.on_finished = lambda: cache_in_background(key, document.text, document.word_index)
+    document.ensure(0)
+    return document
+
+# Function to normalize and tokenize clipboard text (across a process pool
+# when it is large enough for that to pay off) and compute its word
+# durations, returning (text, words, word_index, durations)
+def prepare_clipboard_text(raw):
+    workers = parallel_workers(raw)
+    if workers:
+        from parallel_tokenize import prepare_text_parallel
+        text, words, word_index = prepare_text_parallel(raw, workers)
+    else:
+        text, words, word_index = prepare_text(raw)
+    return text, words, word_index, word_durations(text, word_index)
+
 # Function to stop the reveal process
-def stop_reveal(label, text_widget, speed_var, speed_label):
-    global stop_event, stop_button_press_count, current_index
-    if stop_event is not None:
-        stop_event.set()
+def stop_reveal(word_view, text_view, speed_var, speed_label, stats_label):
+    global stop_button_press_count
+    engine.pause()
+    save_reading_position()
 
     stop_button_press_count += 1
 
     if stop_button_press_count == 2:
         stop_button_press_count = 0
-        current_index = 0
-        label.config(text="")
-        text_widget.delete(1.0, "end")
+        engine.index = 0
+        save_reading_position()
+        engine.unload()
+        pause_button.config(text="Pause")
+        progress_var.set(0)
     
     # Update speed label with the last used speed (no reset to default)
     update_speed_label(speed_var, speed_label)
 
+# Function to pause a running session, or resume the loaded document where it was paused
+def toggle_pause(speed_var):
+    global last_speed
+    if engine.running:
+        engine.pause()
+    elif engine.words:
+        last_speed = speed_var.get()
+        engine.resume(last_speed)
+        pause_button.config(text="Pause")
+
+# Function to jump `offset` words forwards (or backwards) in the loaded document
+def seek_words(offset):
+    engine.seek(engine.index + offset)
+    show_progress()
+
+# Function to jump back or ahead by a sentence or a paragraph
+def seek_structure(paragraph, forward):
+    if paragraph:
+        engine.seek_paragraph(forward)
+    else:
+        engine.seek_sentence(forward)
+    show_progress()
+
+# Function to hold the progress bar still while it is dragged
+def start_progress_drag():
+    global progress_dragging
+    progress_dragging = True
+
+# Function to jump to the position the progress bar was dragged to
+def seek_percent(value):
+    global progress_dragging
+    progress_dragging = False
+    engine.seek_fraction(float(value) / 100)
+
 # Function to bring the window to the front
 def bring_window_to_front(root):
     root.lift()
@@ -154,33 +412,85 @@ def bring_window_to_front(root):
 
 # Function to open the color chooser dialog
 def open_color_chooser():
-    global highlight_color, label
+    global highlight_color, word_view
+    from tkinter import colorchooser
     color = colorchooser.askcolor(initialcolor=highlight_color)[1]
     if color:
         highlight_color = color
         settings["highlight_color"] = highlight_color
-        save_settings(settings)
-        # Update the label and text widget foreground color
-        label.config(foreground=highlight_color)
+        # Update the word view and text widget foreground color
+        word_view.set_color(highlight_color)
         update_highlight_color_for_text_widget()
 
 # Function to update highlight color for text widget
 def update_highlight_color_for_text_widget():
     global highlight_color
-    text_widget.tag_configure("highlight", foreground=highlight_color)
+    text_view.set_color(highlight_color)
+
+# Function to save where reading stopped, flush pending settings and close
+# the window (closing it mid-read is the usual way to leave off)
+def close_window(root):
+    engine.pause()
+    save_reading_position()
+    settings.flush()
+    root.destroy()
+
+# Function to register the global hotkeys once the window is showing
+def register_hotkey(root, word_view, speed_var, text_view, speed_value_label, stats_label):
+    import keyboard
+    # The keyboard hook runs on its own thread, so hand the work to the Tk event loop
+    keyboard.add_hotkey(
+        "ctrl+alt+shift+q",
+        lambda: root.after(0, start_reveal_process, word_view, speed_var, root, text_view, speed_value_label, stats_label),
+        suppress=True
+    )
+    # Previous/next sentence and paragraph, also handed to the Tk event loop
+    for hotkey, paragraph, forward in (("ctrl+alt+shift+left", False, False), ("ctrl+alt+shift+right", False, True),
+                                       ("ctrl+alt+shift+up", True, False), ("ctrl+alt+shift+down", True, True)):
+        keyboard.add_hotkey(
+            hotkey,
+            lambda paragraph=paragraph, forward=forward: root.after(0, seek_structure, paragraph, forward),
+            suppress=True
+        )
+
+# Function to start preparing copied text in the background
+def start_clipboard_watcher():
+    global clipboard_watcher
+    import pyperclip
+    from clipboard_watcher import ClipboardWatcher
+    clipboard_watcher = ClipboardWatcher(pyperclip.paste, prepare_clipboard_text)
+    clipboard_watcher.start()
 
 # Main function to create the GUI
-def main():
-    global label, text_widget
+def main(profile_startup=False, path=None):
+    global settings, document_cache, highlight_color, word_view, text_view, timing_overlay
+    global engine, pause_button, progress_var
+    main_start = time.perf_counter()
+    mark_startup_phase("import tkinter + ttk", startup_time, import_tk_time)
+    mark_startup_phase("import reader modules", import_tk_time, import_app_time)
+
+    # Load the initial settings from config.json (or defaults); changes are
+    # written back behind the UI, and whatever is still pending is flushed at exit
+    settings = SettingsStore(config_path, default_settings)
+    atexit.register(settings.flush)
+    highlight_color = settings.get("highlight_color", default_settings["highlight_color"])
+    default_speed = settings.get("speed", default_settings["speed"])
+    document_cache = DocumentCache(cache_folder, settings["cache_max_mb"] * 1024 * 1024)
+    mark_startup_phase("load settings", main_start)
 
     root = tk.Tk()
     root.title("Speed Read")
     root.geometry("515x575")
     root.iconbitmap('icon.ico')
+    settings.attach(root)
+    root.protocol("WM_DELETE_WINDOW", lambda: close_window(root))
+    mark_startup_phase("create Tk root")
 
-    # Initialize label globally
-    label = tk.Label(root, text="", font=("Helvetica", 22), wraplength=580, justify="center", foreground=highlight_color)
-    label.pack(pady=28)
+    # The current word, drawn on a canvas of fixed height so showing a word
+    # never relayouts the window
+    word_canvas = tk.Canvas(root, width=500, height=84, highlightthickness=0, bg=root["bg"])
+    word_canvas.pack(pady=4, fill="x")
+    word_view = WordCanvas(word_canvas, ("Helvetica", 22), highlight_color)
 
     # Button frame
     button_frame = tk.Frame(root)
@@ -194,29 +504,81 @@ def main():
     speed_slider = ttk.Scale(root, from_=1, to=15, variable=speed_var, orient="horizontal", length=500)
     speed_slider.pack(fill="x", padx=20)
 
-    speed_value_label = tk.Label(root, text=f"{default_speed:.2f} words per second / {1 / default_speed:.2f} seconds per word", font=("Helvetica", 8), fg="gray")
+    speed_value_label = tk.Label(root, text=speed_text(default_speed), font=("Helvetica", 8), fg="gray")
     speed_value_label.pack()
 
+    # Achieved vs. target speed of the last session
+    stats_label = tk.Label(root, text="", font=("Helvetica", 8), fg="gray")
+    stats_label.pack()
+
     speed_slider.config(command=lambda val: update_speed_label(speed_var, speed_value_label))
 
     # Start/Stop buttons
     start_button = ttk.Button(
         button_frame,
         text="Start",
-        command=lambda: start_reveal_process(label, speed_var, root, text_widget, speed_value_label)
+        command=lambda: start_reveal_process(word_view, speed_var, root, text_view, speed_value_label, stats_label)
     )
     start_button.pack(side="left", padx=2, ipadx=2, ipady=2)
 
     stop_button = ttk.Button(
         button_frame,
         text="Stop",
-        command=lambda: stop_reveal(label, text_widget, speed_var, speed_value_label)
+        command=lambda: stop_reveal(word_view, text_view, speed_var, speed_value_label, stats_label)
     )
     stop_button.pack(side="left", padx=2, ipadx=2, ipady=2)
 
+    pause_button = ttk.Button(
+        button_frame,
+        text="Pause",
+        command=lambda: toggle_pause(speed_var)
+    )
+    pause_button.pack(side="left", padx=2, ipadx=2, ipady=2)
+
+    open_button = ttk.Button(
+        button_frame,
+        text="Open",
+        command=lambda: open_file_dialog(word_view, speed_var, root, text_view, speed_value_label, stats_label)
+    )
+    open_button.pack(side="left", padx=2, ipadx=2, ipady=2)
+
     # Text widget
     text_widget = tk.Text(root, wrap="word", height=10, width=70, font=("Helvetica", 12))
     text_widget.pack(pady=20, fill="both", expand=True)
+    if settings["full_text_view"]:
+        # The whole document goes into the widget a slice at a time, with
+        # how much is in so far shown in its corner until it is complete
+        loading_label = tk.Label(text_widget, text="", font=("Helvetica", 8), fg="gray", bg=text_widget["bg"])
+
+        def show_loading_progress(fraction):
+            if fraction < 1.0:
+                loading_label.config(text=f"Loading text {fraction:.0%}")
+                loading_label.place(relx=1.0, rely=1.0, anchor="se")
+            else:
+                loading_label.place_forget()
+
+        text_view = FullTextView(text_widget, highlight_color, show_loading_progress)
+    else:
+        # Only a window of paragraphs around the current word is kept in the widget
+        text_view = VirtualTextView(text_widget, highlight_color)
+    engine = ReadingEngine(TkRenderer(word_view, text_view), on_reveal_tick,
+                           lambda scheduler: end_reveal_session(scheduler, stats_label))
+
+    # Position in the document; dragging it seeks
+    progress_var = tk.DoubleVar(value=0)
+    # Dragging only moves the bar; the seek happens once it is released
+    progress_slider = ttk.Scale(root, from_=0, to=100, variable=progress_var, orient="horizontal")
+    progress_slider.pack(fill="x", padx=20)
+    progress_slider.bind("<ButtonPress-1>", lambda event: start_progress_drag())
+    progress_slider.bind("<ButtonRelease-1>", lambda event: seek_percent(progress_var.get()))
+    root.bind("<Control-Left>", lambda event: seek_words(-10))
+    root.bind("<Control-Right>", lambda event: seek_words(10))
+
+    # Frame timing overlay
+    timing_overlay = tk.Label(root, text="", font=("Helvetica", 8), fg="gray")
+    if settings["timing_overlay"]:
+        timing_overlay.place(x=4, y=2)
+    root.bind("<F2>", lambda event: toggle_timing_overlay())
 
     # Settings button to open color chooser
     settings_button = ttk.Button(
@@ -228,13 +590,6 @@ def main():
     )
     settings_button.pack(side="right", padx=10, pady=2)
 
-    # Hotkey
-    keyboard.add_hotkey(
-        "ctrl+alt+shift+q",
-        lambda: start_reveal_process(label, speed_var, root, text_widget, speed_value_label),
-        suppress=True
-    )
-
     # Instructions label
     instructions = tk.Label(
         root,
@@ -245,8 +600,35 @@ def main():
         justify="right"
     )
     instructions.pack(pady=2, fill="x", padx=10)
-
+    mark_startup_phase("build widgets")
+
+    # Everything not needed for the first paint waits until the window is
+    # mapped and its pending redraws (queued before us) have run
+    def on_first_map(event):
+        if event.widget is root:
+            root.unbind("<Map>")
+            root.after_idle(finish_startup)
+
+    def finish_startup():
+        mark_startup_phase("first window painted")
+        if path is not None:
+            start_reading_file(path, word_view, speed_var, root, text_view, speed_value_label, stats_label)
+            mark_startup_phase("open file")
+        register_hotkey(root, word_view, speed_var, text_view, speed_value_label, stats_label)
+        mark_startup_phase("import keyboard + add hotkey")
+        if settings["watch_clipboard"]:
+            start_clipboard_watcher()
+            mark_startup_phase("start clipboard watcher")
+        if profile_startup:
+            print_startup_profile()
+
+    root.bind("<Map>", on_first_map)
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
+    # Lets the worker processes of parallel tokenization start in the PyInstaller build
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()
+    paths = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    main(profile_startup="--profile-startup" in sys.argv, path=paths[0] if paths else None)
@@ -0,0 +1,192 @@
+import time
+from array import array
+from itertools import compress, islice, repeat
+from operator import add, mul, ne, sub
+
+from document import closers
+
+
+# Paces words against absolute deadlines (start + n / speed) instead of
+# sleeping a fixed interval after each word, so the time spent rendering a
+# word is absorbed by the next sleep rather than accumulating as drift
+class DeadlineScheduler:
+    def __init__(self, speed, clock=time.perf_counter, sleep=time.sleep, max_lag=2):
+        self.speed = speed  # Target words per second
+        self.clock = clock
+        self.sleep = sleep
+        self.max_lag = max_lag  # Intervals we may fall behind before giving up on catching up
+        self.start_time = None
+        self.next_deadline = None
+        self.ticks = 0  # Words (or chunks) shown this session
+        self.words = 0  # Words shown this session, counting every word of a chunk
+        self.weight = 1.0  # Relative duration of the word currently shown
+        self.resyncs = 0  # Times the schedule was re-anchored after falling too far behind
+
+    # Function to start a new session at the current time
+    def start(self):
+        self.start_time = self.clock()
+        self.next_deadline = self.start_time
+        self.ticks = 0
+        self.words = 0
+        self.resyncs = 0
+
+    # Function to record a shown word and return the seconds until the next
+    # one is due; `weight` stretches or shortens this word's 1/speed slot and
+    # `words` is how many words it showed (more than one in chunk mode)
+    def advance(self, weight=1.0, words=1):
+        interval = weight / self.speed
+        self.weight = weight
+        self.ticks += 1
+        self.words += words
+        self.next_deadline += interval
+        now = self.clock()
+        delay = self.next_deadline - now
+
+        if delay > 0:
+            return delay
+        if -delay > interval * self.max_lag:
+            # Too far behind: drop the backlog instead of flashing a burst of words
+            self.next_deadline = now
+            self.resyncs += 1
+        # Otherwise we are slightly late: show the next word immediately to catch up
+        return 0.0
+
+    # Function to change the speed mid-session. The word already waiting is
+    # moved onto the new cadence too, so the change applies to the next word
+    def set_speed(self, speed):
+        if self.ticks:
+            self.next_deadline += self.weight / speed - self.weight / self.speed
+        self.speed = speed
+
+    # Returns the seconds left until the next word is due
+    def delay(self):
+        return max(0.0, self.next_deadline - self.clock())
+
+    # Function to block until the next word is due
+    def wait(self, weight=1.0):
+        delay = self.advance(weight)
+        if delay > 0:
+            self.sleep(delay)
+
+    # Function to compute the flashes (words or chunks) per second actually achieved this session
+    def achieved_speed(self, count=None):
+        elapsed = self.clock() - self.start_time
+        if elapsed <= 0:
+            return 0.0
+        return (self.ticks if count is None else count) / elapsed
+
+    # Function to describe achieved vs. target speed for the session
+    def summary(self):
+        if self.words == self.ticks:
+            return f"Last session: {self.achieved_speed():.2f} of {self.speed:.2f} words per second"
+        return (f"Last session: {self.achieved_speed():.2f} of {self.speed:.2f} flashes per second, "
+                f"{self.achieved_speed(self.words):.2f} words per second")
+
+
+# Relative display time by word length (index = length, capped at the last
+# entry): short function words go by quicker, long words linger
+LENGTH_WEIGHTS = (1.0, 0.8, 0.8, 0.85, 0.9, 0.95, 1.0, 1.05, 1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8)
+# Extra time for a word ending in punctuation (clause and sentence ends),
+# also inside closing quotes or brackets
+PUNCTUATION_WEIGHTS = {",": 1.5, ";": 1.8, ":": 1.8, ".": 2.2, "!": 2.2, "?": 2.2,
+                       "\u2014": 1.5, ")": 1.3, "\"": 1.3, "\u201d": 1.3}
+PARAGRAPH_WEIGHT = 2.5  # Pause after the last word of a paragraph (replaces its punctuation pause)
+
+
+# Function to compute every word's display time up front, as multiples of
+# 1/speed. Built from map() over the word index's arrays rather than a
+# Python loop per word, and normalized so the durations average 1.0, which
+# keeps the average pace equal to the slider's words per second. `text` may
+# be a piece of the normalized text that starts at character `offset`
+def word_durations(text, word_index, offset=0):
+    starts, ends, lines = word_index.starts, word_index.ends, word_index.lines
+    if not len(starts):
+        return array("d")
+
+    last_length = len(LENGTH_WEIGHTS) - 1
+    length_weights = map(LENGTH_WEIGHTS.__getitem__, map(min, map(sub, ends, starts), repeat(last_length)))
+    last_characters = list(map(text.__getitem__, map(add, ends, repeat(-1 - offset))))
+    punctuation_weights = array("d", map(PUNCTUATION_WEIGHTS.get, last_characters, repeat(1.0)))
+    # A word ending in closing quotes or brackets gets the pause of the
+    # punctuation inside them if that is longer, e.g. "Stop." ends a sentence
+    for word in compress(range(len(last_characters)), map(closers.__contains__, last_characters)):
+        inner = text[starts[word] - offset:ends[word] - offset].rstrip(closers)[-1:]
+        punctuation_weights[word] = max(punctuation_weights[word], PUNCTUATION_WEIGHTS.get(inner, 1.0))
+    # A word ends a paragraph when the next word is on a later line
+    paragraph_ends = map(ne, lines, islice(lines, 1, None))
+    paragraph_weights = map((1.0, PARAGRAPH_WEIGHT).__getitem__, paragraph_ends)
+
+    durations = array("d", map(mul, length_weights, map(max, punctuation_weights, paragraph_weights)))
+    # The last word has no next line to compare with, but a text (and every
+    # block of one) ends at a line end, so it always ends a paragraph
+    last_weight = max(punctuation_weights[-1], PARAGRAPH_WEIGHT)
+    durations.append(LENGTH_WEIGHTS[min(ends[-1] - starts[-1], last_length)] * last_weight)
+    scale = len(durations) / sum(durations)
+    return array("d", map(mul, durations, repeat(scale)))
+
+
+# Function to turn per-word durations into per-chunk durations: each chunk
+# gets the mean of its words' durations, so the slider sets flashes per
+# second and multi-word chunks raise the words read per second
+def chunk_durations(durations, chunks):
+    means = array("d", (
+        sum(durations[first:last + 1]) / (last - first + 1)
+        for first, last in zip(chunks.firsts, chunks.lasts)
+    ))
+    if not means:
+        return means
+    scale = len(means) / sum(means)
+    return array("d", map(mul, means, repeat(scale)))
+
+
+# Per-word frame timings kept in a preallocated ring buffer: the time each
+# word was due, when it was actually shown and how long the Tk work took
+# (seconds from the start of the session). Only the most recent `capacity`
+# words are kept, so recording never allocates
+class FrameTimings:
+    def __init__(self, capacity=16384):
+        self.capacity = capacity
+        self.targets = array("d", bytes(8 * capacity))
+        self.shown = array("d", bytes(8 * capacity))
+        self.work = array("d", bytes(8 * capacity))
+        self.count = 0  # Words recorded this session (may exceed capacity)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    # Function to record one word's timings
+    def record(self, target, shown, work):
+        slot = self.count % self.capacity
+        self.targets[slot] = target
+        self.shown[slot] = shown
+        self.work[slot] = work
+        self.count += 1
+
+    # Yields (word number, target, shown, work) for the kept words, oldest first
+    def frames(self):
+        for number in range(self.count - len(self), self.count):
+            slot = number % self.capacity
+            yield number, self.targets[slot], self.shown[slot], self.work[slot]
+
+    # Returns the lateness (shown - target, in seconds) at each requested percentile
+    def lateness_percentiles(self, *fractions):
+        lateness = sorted(shown - target for _, target, shown, _ in self.frames())
+        if not lateness:
+            return [0.0 for _ in fractions]
+        return [lateness[min(len(lateness) - 1, int(len(lateness) * fraction))] for fraction in fractions]
+
+    # Function to write the kept timings to a .csv or .json file
+    def export(self, path):
+        import csv
+        import json
+        rows = [
+            {"word": number, "target_s": target, "shown_s": shown, "work_s": work, "late_ms": (shown - target) * 1000}
+            for number, target, shown, work in self.frames()
+        ]
+        with open(path, "w", newline="") as file:
+            if path.endswith(".json"):
+                json.dump({"words_recorded": self.count, "frames": rows}, file, indent=1)
+            else:
+                writer = csv.DictWriter(file, fieldnames=["word", "target_s", "shown_s", "work_s", "late_ms"])
+                writer.writeheader()
+                writer.writerows(rows)
@@ -0,0 +1,124 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from document import (WordIndex, Words, iter_line_blocks, iter_line_spans, normalize_blocks, normalize_lines,
+                      prepare_text)
+from lazy_document import tokenize_blocks
+from pipeline import iter_text_blocks
+
+MIN_SEGMENT = 4 << 20  # Smallest slice of raw text worth sending to a worker
+PIPELINE_SEGMENT = 1 << 20  # Slice sent to a worker when the result is read piece by piece
+POOL_AFTER = 1 << 16  # Characters tokenized in the reading thread before the pool is started
+
+
+# Function to cut raw text (from `start`, a line start) into about `count`
+# segments at line breaks, returned as (start, end) spans. Lines are
+# normalized independently of each other, so a segment that starts at a
+# line start normalizes exactly as it would in the whole text
+def split_segments(raw, count, start=0, min_size=MIN_SEGMENT):
+    return list(iter_line_spans(raw, max(min_size, (len(raw) - start) // count + 1), start))
+
+
+# Normalizes one segment in a worker process (first pass)
+def normalize_segment(segment):
+    return "\n".join(normalize_lines(segment))
+
+
+# Builds the WordIndex tables of one normalized segment in a worker process
+# (second pass). The segment's position in the whole text is known by now,
+# so the offsets come out final and only need to be concatenated
+def index_segment(job):
+    normalized, offset, word_offset, line = job
+    word_index = WordIndex()
+    for _, _, chunk_index in normalize_blocks(iter_line_blocks(normalized), offset, word_offset, line):
+        word_index.extend(chunk_index)
+    return (word_index.starts, word_index.ends, word_index.lines, word_index.columns,
+            word_index.sentences, word_index.paragraphs)
+
+
+# Yields, for each (non-empty) normalized segment, where it goes in the
+# whole text: (segment, length of the text before it, words before it, its
+# first line). Segments are joined by newlines; by default the first one
+# starts the text
+def segment_jobs(normalized_segments, offset=0, words=0, line=1):
+    for normalized in normalized_segments:
+        yield normalized, offset, words, line
+        offset += len(normalized) + (1 if offset else 0)
+        words += normalized.count(" ") + normalized.count("\n") + 1
+        line += normalized.count("\n") + 1
+
+
+# Function to prepare_text() a large text across a pool of worker
+# processes (all cores by default). Tokenizing is most of the work and
+# needs to know how much text, how many words and how many lines precede
+# each segment, so it runs in two passes: the workers first normalize
+# their segments, which gives those counts, then build the tables of each
+# segment at its final offsets, which the parent just concatenates
+def prepare_text_parallel(raw, workers=None):
+    workers = workers or os.cpu_count() or 1
+    spans = split_segments(raw, workers * 4)
+    if workers == 1 or len(spans) == 1:
+        return prepare_text(raw)
+
+    segments = [raw[start:end] for start, end in spans]
+    with ProcessPoolExecutor(min(workers, len(segments))) as executor:
+        normalized_segments = [normalized for normalized in executor.map(normalize_segment, segments) if normalized]
+        del segments
+        word_index = WordIndex()
+        for tables in executor.map(index_segment, segment_jobs(normalized_segments)):
+            for table, part in zip((word_index.starts, word_index.ends, word_index.lines, word_index.columns,
+                                    word_index.sentences, word_index.paragraphs), tables):
+                table.extend(part)
+
+    text = "\n".join(normalized_segments)
+    return text, Words(text, word_index), word_index
+
+
+# Yields the whole text as tokenized pieces, (piece, WordIndex, fraction)
+# like tokenize_blocks(), for reading while it is still being tokenized
+# (see LazyDocument). The first MIN_SEGMENT characters are tokenized right
+# here, block by block, so the first words come out at once. Once the first
+# few thousand words are out, the pool starts normalizing the rest, then
+# builds its tables at their final offsets; those come out a segment at a
+# time, in order
+def iter_pieces_parallel(raw, workers=None):
+    workers = workers or os.cpu_count() or 1
+    head_end = raw.find("\n", MIN_SEGMENT)
+    if workers == 1 or head_end == -1:
+        yield from tokenize_blocks(iter_text_blocks(raw))
+        return
+
+    executor = None
+    normalizing = None
+
+    def normalize_tail():
+        nonlocal executor
+        executor = ProcessPoolExecutor(workers)
+        spans = split_segments(raw, workers * 4, head_end + 1, PIPELINE_SEGMENT)
+        return [(executor.submit(normalize_segment, raw[start:end]), end + 1) for start, end in spans]
+
+    try:
+        offset = words = 0
+        line = 1
+        for piece, piece_index, fraction in tokenize_blocks(iter_text_blocks(raw[:head_end])):
+            yield piece, piece_index, fraction * head_end / len(raw)
+            offset += len(piece)
+            words += len(piece_index)
+            line = piece_index.lines[-1] + 1
+            if normalizing is None and offset >= POOL_AFTER:
+                normalizing = normalize_tail()
+        if normalizing is None:
+            normalizing = normalize_tail()
+
+        tail = [(future.result(), end) for future, end in normalizing]
+        del normalizing
+        tail = [(normalized, end) for normalized, end in tail if normalized]
+        jobs = list(segment_jobs((normalized for normalized, _ in tail), offset, words, line))
+        for (normalized, offset, _, _), (_, end), tables in zip(jobs, tail, executor.map(index_segment, jobs)):
+            piece_index = WordIndex()
+            (piece_index.starts, piece_index.ends, piece_index.lines, piece_index.columns,
+             piece_index.sentences, piece_index.paragraphs) = tables
+            yield ("\n" + normalized if offset else normalized), piece_index, min(1.0, end / len(raw))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,85 @@
+import queue
+import threading
+
+from document import iter_line_spans
+
+QUEUE_SIZE = 8  # Tokenized pieces the producer may get ahead of the reader
+FIRST_BLOCK = 1 << 12  # Raw characters in the first block; each next one is twice as large
+MAX_BLOCK = 1 << 18  # Raw characters in a block at most, which bounds what one tick appends
+
+
+# Yields (block of whole lines, fraction of the text consumed after it) for
+# a text already in memory, in the form tokenize_blocks() takes. Blocks
+# start small and double up to `block_size`, so the first words are ready
+# after a few kilobytes however long the text is, while the rest still goes
+# in batches large enough to keep the per-block overhead low
+def iter_text_blocks(raw, block_size=MAX_BLOCK):
+    for start, end in iter_line_spans(raw, block_size, first_size=FIRST_BLOCK):
+        yield raw[start:end], end / len(raw)
+
+
+# Runs an iterator of paced pieces (see pace_pieces) on a background
+# thread, handing them over through a bounded queue, so the reader can start
+# on the first piece while the rest is still being tokenized and paced. The queue
+# keeps the producer at most QUEUE_SIZE pieces ahead of the reader taking
+# them. Iterating it blocks until the next piece is ready; ready() tells
+# whether that would block
+class BackgroundTokenizer(threading.Thread):
+    def __init__(self, pieces, queue_size=QUEUE_SIZE):
+        super().__init__(daemon=True)
+        self.pieces = pieces
+        self.queue = queue.Queue(queue_size)
+        self.stopped = threading.Event()
+        self.error = None
+        self.done = False
+        self.start()
+
+    def run(self):
+        try:
+            for piece in self.pieces:
+                if not self.put(piece):
+                    return
+        except Exception as error:
+            self.error = error
+        finally:
+            if hasattr(self.pieces, "close"):
+                self.pieces.close()
+        self.put(None)
+
+    # Function to queue a piece, giving up once the reader has closed us
+    def put(self, piece):
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(piece, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.done:
+            raise StopIteration
+        piece = self.queue.get()
+        if piece is None:
+            self.done = True
+            if self.error is not None:
+                raise self.error
+            raise StopIteration
+        return piece
+
+    # Returns True if the next piece (or the end) can be taken without waiting
+    def ready(self):
+        return not self.done and not self.queue.empty()
+
+    # Function to stop the producer and drop whatever it queued
+    def close(self):
+        self.stopped.set()
+        self.done = True
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
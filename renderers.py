@@ -0,0 +1,170 @@
+import heapq
+import time
+from itertools import count
+
+# A renderer shows what a ReadingEngine hands it and runs the engine's
+# timers on its own event loop. Every renderer has:
+#   load(text, word_index)   switch to a document (its normalized text and WordIndex)
+#   show(word, first, last)  show a word (or chunk) made of words first..last
+#   clear()                  forget the document
+#   after(delay, callback)   call back after `delay` seconds, returning a job
+#   cancel(job)              drop a pending callback
+
+
+# Renders into the Tk window: the word view (see word_view.py) shows the
+# word and the virtual text view highlights it in context. Timers are
+# root.after calls
+class TkRenderer:
+    def __init__(self, word_view, text_view):
+        self.word_view = word_view
+        self.text_view = text_view
+
+    def load(self, text, word_index):
+        self.text_view.load(text, word_index)
+
+    def show(self, word, first, last):
+        self.word_view.show_word(word)
+        self.text_view.highlight_word(first, last)
+
+    def clear(self):
+        self.word_view.clear()
+        self.text_view.clear()
+
+    def after(self, delay, callback):
+        return self.word_view.after(round(delay * 1000), callback)
+
+    def cancel(self, job):
+        self.word_view.after_cancel(job)
+
+
+# Timer queue for renderers that have no event loop of their own
+class TimerLoop:
+    def __init__(self, clock=time.perf_counter, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.timers = []  # Heap of (due time, job, callback)
+        self.cancelled = set()
+        self.jobs = count()
+
+    def after(self, delay, callback):
+        job = next(self.jobs)
+        heapq.heappush(self.timers, (self.clock() + delay, job, callback))
+        return job
+
+    def cancel(self, job):
+        self.cancelled.add(job)
+
+    # Returns the seconds until the next timer is due, or None if there is none
+    def next_delay(self):
+        timers = self.timers
+        while timers and timers[0][1] in self.cancelled:
+            self.cancelled.discard(heapq.heappop(timers)[1])
+        if not timers:
+            return None
+        return max(0.0, timers[0][0] - self.clock())
+
+    # Function to run every timer that is due
+    def run_due(self):
+        while self.next_delay() == 0.0:
+            heapq.heappop(self.timers)[2]()
+
+    # Function to run timers, sleeping until each is due, until none are left
+    def run(self):
+        while True:
+            delay = self.next_delay()
+            if delay is None:
+                return
+            if delay > 0:
+                self.sleep(delay)
+            self.run_due()
+
+
+# Shows nothing and only counts what it was asked to show. With a fake
+# clock and sleep it runs whole sessions instantly, for benchmarks
+class NullRenderer(TimerLoop):
+    def __init__(self, clock=time.perf_counter, sleep=time.sleep):
+        super().__init__(clock, sleep)
+        self.shown = 0  # Words (or chunks) shown
+        self.last = None  # (word, first, last) shown last
+
+    def load(self, text, word_index):
+        pass
+
+    def show(self, word, first, last):
+        self.shown += 1
+        self.last = (word, first, last)
+
+    def clear(self):
+        self.last = None
+
+
+# Renders into a curses window: the word in the middle of the screen, the
+# text around it on the line below with the word highlighted, and a status
+# line at the bottom. Key presses and timers share one getch() loop
+class CursesRenderer(TimerLoop):
+    def __init__(self, screen, clock=time.perf_counter, sleep=time.sleep):
+        super().__init__(clock, sleep)
+        self.screen = screen
+        self.text = ""
+        self.word_index = None
+        self.status = ""
+
+    def load(self, text, word_index):
+        self.text = text
+        self.word_index = word_index
+
+    def show(self, word, first, last):
+        import curses
+        height, width = self.screen.getmaxyx()
+        middle = height // 2
+        self.screen.erase()
+        self.put(middle - 1, max(0, (width - len(word)) // 2), word, curses.A_BOLD)
+
+        # Context: as much of the text as fits, centered on the word
+        start, end = self.word_index.starts[first], self.word_index.ends[last]
+        before = max(0, (width - (end - start)) // 2)
+        context_start = max(0, start - before)
+        row = middle + 1
+        self.put(row, 0, self.text[context_start:start].replace("\n", " "))
+        self.put(row, start - context_start, self.text[start:end].replace("\n", " "), curses.A_REVERSE)
+        self.put(row, end - context_start, self.text[end:end + width].replace("\n", " "))
+        self.put(height - 1, 0, self.status, curses.A_DIM)
+        self.screen.refresh()
+
+    def clear(self):
+        self.text = ""
+        self.word_index = None
+        self.screen.erase()
+        self.screen.refresh()
+
+    # Function to replace the status line
+    def set_status(self, status):
+        import curses
+        self.status = status
+        height, _ = self.screen.getmaxyx()
+        self.screen.move(height - 1, 0)
+        self.screen.clrtoeol()
+        self.put(height - 1, 0, status, curses.A_DIM)
+        self.screen.refresh()
+
+    # Function to write text clipped to the screen (curses raises when
+    # writing into the last column of the last line)
+    def put(self, row, column, text, attributes=0):
+        import curses
+        height, width = self.screen.getmaxyx()
+        if not 0 <= row < height or column >= width:
+            return
+        try:
+            self.screen.addstr(row, column, text[:width - column], attributes)
+        except curses.error:
+            pass
+
+    # Function to run timers and pass key presses to `on_key` until it returns False
+    def run(self, on_key):
+        while True:
+            delay = self.next_delay()
+            self.screen.timeout(-1 if delay is None else round(delay * 1000))
+            key = self.screen.getch()
+            if key != -1 and on_key(key) is False:
+                return
+            self.run_due()
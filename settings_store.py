@@ -0,0 +1,74 @@
+import json
+import os
+
+
+# In-memory settings that are written to disk behind the UI: changes are
+# coalesced and flushed once the debounce timer expires (or at exit), and
+# every write goes to a temp file that is renamed over the config file so
+# a crash can never leave a truncated config behind
+class SettingsStore:
+    def __init__(self, path, defaults, flush_delay_ms=500):
+        self.path = path
+        self.flush_delay_ms = flush_delay_ms
+        self.values = dict(defaults)
+        self.values.update(self.load())
+        self.dirty = False
+        self.widget = None  # Tk widget whose after() drives the debounce timer
+        self.flush_job = None
+
+    # Load settings from the config file, or nothing if it is missing or unreadable
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as file:
+                    return json.load(file)
+            except (json.JSONDecodeError, IOError):
+                pass  # Fall back to default settings if there's an error
+        return {}
+
+    # Function to start debounced flushing on the widget's event loop
+    def attach(self, widget):
+        self.widget = widget
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __setitem__(self, key, value):
+        if key in self.values and self.values[key] == value:
+            return
+        self.values[key] = value
+        self.dirty = True
+        self.schedule_flush()
+
+    # Function to (re)start the debounce timer; without a widget we only flush at exit
+    def schedule_flush(self):
+        if self.widget is None:
+            return
+        if self.flush_job is not None:
+            self.widget.after_cancel(self.flush_job)
+        self.flush_job = self.widget.after(self.flush_delay_ms, self.flush_from_timer)
+
+    def flush_from_timer(self):
+        self.flush_job = None
+        self.flush()
+
+    # Function to write pending changes atomically via temp file + rename
+    def flush(self):
+        if not self.dirty:
+            return
+        import tempfile  # Only needed once something changed, so kept off the startup path
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".config-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(self.values, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.dirty = False
@@ -0,0 +1,113 @@
+# Terminal front-end: reads a file, piped text or the clipboard in a curses
+# window, paced by the same ReadingEngine as the Tk window, so it also
+# works over SSH. Settings are read from the same config.json.
+#
+#   python terminal_reader.py [file] [--speed 5]
+#   some_command | python terminal_reader.py
+#
+# Keys: space pauses/resumes, Left/Right jump to the previous/next sentence,
+# Up/Down to the previous/next paragraph, [ and ] skip 10 words, + and -
+# change the speed and q quits.
+
+import argparse
+import os
+import sys
+
+from engine import ReadingEngine
+from lazy_document import LazyDocument, open_document, tokenize_blocks
+from pipeline import iter_text_blocks
+from renderers import CursesRenderer
+from settings_store import SettingsStore
+
+config_path = "config.json"
+default_settings = {"speed": 4.70, "variable_timing": True, "chunk_words": 1, "chunk_max_chars": 0}
+
+
+# Function to read piped text and point stdin back at the terminal for curses
+def read_piped_text():
+    text = sys.stdin.read()
+    if os.name == "posix":
+        os.dup2(os.open("/dev/tty", os.O_RDONLY), sys.stdin.fileno())
+    return text
+
+
+# Function to load the document into the engine; returns False if there is no text.
+# Piped text is tokenized in the background while reading starts
+def load(engine, path, text, settings):
+    if path is not None:
+        document = open_document(path, settings["chunk_words"], settings["chunk_max_chars"],
+                                 settings["variable_timing"])
+    else:
+        document = LazyDocument(tokenize_blocks(iter_text_blocks(text)), settings["chunk_words"],
+                                settings["chunk_max_chars"], settings["variable_timing"], background=True)
+    document.ensure(0)
+    if not document.words:
+        return False
+    engine.load(document.text, document.words, document.word_index, document.chunks, document.durations,
+                0, document)
+    return True
+
+
+def run(screen, path, text, speed, settings):
+    import curses
+    curses.curs_set(0)
+    renderer = CursesRenderer(screen)
+    engine = ReadingEngine(renderer, on_end=lambda scheduler: renderer.set_status(
+        scheduler.summary() + " - space to continue, q to quit"))
+    if not load(engine, path, text, settings):
+        return "No text to read"
+
+    def show_speed():
+        renderer.set_status(f"{engine.speed:.2f} words per second")
+
+    def on_key(key):
+        if key in (ord("q"), 27):
+            return False
+        if key == ord(" "):
+            if engine.running:
+                engine.pause()
+            else:
+                engine.resume()
+                show_speed()
+        elif key in (curses.KEY_LEFT, curses.KEY_RIGHT):
+            engine.seek_sentence(forward=key == curses.KEY_RIGHT)
+        elif key in (curses.KEY_UP, curses.KEY_DOWN):
+            engine.seek_paragraph(forward=key == curses.KEY_DOWN)
+        elif key in (ord("["), ord("]")):
+            engine.seek(engine.index + (10 if key == ord("]") else -10))
+        elif key in (ord("+"), ord("="), ord("-")):
+            change = -0.5 if key == ord("-") else 0.5
+            engine.set_speed(min(15.0, max(1.0, engine.speed + change)))
+            show_speed()
+        return True
+
+    engine.resume(speed)
+    show_speed()
+    renderer.run(on_key)
+    engine.pause()
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speed read a file, piped text or the clipboard in the terminal")
+    parser.add_argument("path", nargs="?", help="text, EPUB or HTML file (default: stdin or the clipboard)")
+    parser.add_argument("--speed", type=float, help="words per second (default: the speed saved in config.json)")
+    args = parser.parse_args()
+
+    settings = SettingsStore(config_path, default_settings)
+    text = None
+    if args.path is None:
+        if not sys.stdin.isatty():
+            text = read_piped_text()
+        else:
+            import pyperclip
+            text = pyperclip.paste()
+
+    import curses
+    error = curses.wrapper(run, args.path, text, args.speed or settings["speed"], settings)
+    if error:
+        sys.exit(error)
+
+
+if __name__ == "__main__":
+    main()
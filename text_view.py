@@ -0,0 +1,217 @@
+import time
+from bisect import bisect_left, bisect_right
+
+
+# Keeps the "highlight" tag on a single word and moves it incrementally,
+# touching only the previous and the new word's range on each tick
+class HighlightManager:
+    def __init__(self, text_widget, color):
+        self.text_widget = text_widget
+        self.current_range = None
+        self.text_widget.tag_configure("highlight", foreground=color)
+
+    # Function to move the highlight to a new range
+    def move_to(self, start_idx, end_idx):
+        if self.current_range is not None:
+            self.text_widget.tag_remove("highlight", *self.current_range)
+        self.text_widget.tag_add("highlight", start_idx, end_idx)
+        self.current_range = (start_idx, end_idx)
+        self.text_widget.see(start_idx)
+
+    # Function to change the highlight color (the only time the tag is reconfigured)
+    def set_color(self, color):
+        self.text_widget.tag_configure("highlight", foreground=color)
+
+    # Function to forget the highlighted range after the text is replaced
+    def reset(self):
+        self.current_range = None
+
+
+# Shows a document in a Text widget while only ever holding a window of
+# paragraphs around the current word. When reading moves past the window
+# the next one is swapped in, so the widget's size (and the cost of
+# filling it) does not depend on the length of the document
+class VirtualTextView:
+    paragraphs_before = 5  # Paragraphs (lines) of context kept above the current one
+    paragraphs_after = 40  # Paragraphs loaded ahead of the current one
+    max_words_before = 300  # Caps for documents that are one huge paragraph
+    max_words_after = 3000
+
+    def __init__(self, text_widget, color):
+        self.text_widget = text_widget
+        self.highlighter = HighlightManager(text_widget, color)
+        self.text = ""
+        self.word_index = None
+        self.first = 0  # First word in the widget
+        self.last = -1  # Last word in the widget
+        self.first_line = 1  # Document line of the first word
+        self.first_column = 0  # Document column of the first word
+
+    # Function to show a new document (nothing is inserted until a word is highlighted)
+    def load(self, text, word_index):
+        self.text = text
+        self.word_index = word_index
+        self.clear_window()
+
+    # Function to empty the widget and forget the document
+    def clear(self):
+        self.text = ""
+        self.word_index = None
+        self.clear_window()
+
+    def clear_window(self):
+        self.first, self.last = 0, -1
+        self.text_widget.delete("1.0", "end")
+        self.highlighter.reset()
+
+    # Function to fill the widget with the window around a word
+    def load_window(self, index):
+        lines = self.word_index.lines
+        line = lines[index]
+        first = bisect_left(lines, line - self.paragraphs_before)
+        last = bisect_right(lines, line + self.paragraphs_after) - 1
+        self.first = max(first, index - self.max_words_before)
+        self.last = min(last, index + self.max_words_after)
+        self.first_line = lines[self.first]
+        self.first_column = self.word_index.columns[self.first]
+
+        start = self.word_index.starts[self.first]
+        end = self.word_index.ends[self.last]
+        self.text_widget.delete("1.0", "end")
+        self.text_widget.insert("1.0", self.text[start:end])
+        self.highlighter.reset()
+
+    # Returns the widget's "line.column" start and end indices of a word (or
+    # of the words first..last, which must be on one line) in the window
+    def tk_range(self, first, last=None):
+        word_index = self.word_index
+        if last is None:
+            last = first
+        line = word_index.lines[first]
+        column = word_index.columns[first]
+        if line == self.first_line:
+            column -= self.first_column
+        length = word_index.ends[last] - word_index.starts[first]
+        line = line - self.first_line + 1
+        return f"{line}.{column}", f"{line}.{column + length}"
+
+    # Function to highlight a word (or a chunk of words on one line),
+    # swapping in its window first if needed
+    def highlight_word(self, first, last=None):
+        if not self.first <= first <= (first if last is None else last) <= self.last:
+            self.load_window(first)
+        self.highlighter.move_to(*self.tk_range(first, last))
+
+    def set_color(self, color):
+        self.highlighter.set_color(color)
+
+
+# Inserts a long text at the end of a Text widget a slice at a time from
+# after() callbacks. Each turn of the event loop inserts slices until a
+# frame budget is used up, and the slice size adapts to how long the last
+# insert took, so the window keeps handling input (e.g. the Stop button)
+# while a large document goes in. The text may grow while it is being
+# inserted (a LazyDocument); resume() picks up whatever has been added
+class IncrementalInserter:
+    budget = 0.008  # Seconds of inserting per turn of the event loop
+    first_slice = 1 << 12  # Characters in the first slice
+    min_slice = 1 << 8
+
+    def __init__(self, text_widget, on_step=None, clock=time.perf_counter):
+        self.text_widget = text_widget
+        self.on_step = on_step  # Called after every turn of inserting
+        self.clock = clock
+        self.text = ""
+        self.loaded = 0  # Characters of the text inserted so far
+        self.slice_size = self.first_slice
+        self.job = None
+
+    # Function to start inserting a text into the (empty) widget
+    def start(self, text):
+        self.cancel()
+        self.text = text
+        self.loaded = 0
+        self.resume()
+
+    # Function to carry on inserting if there is text left (and not already doing so)
+    def resume(self):
+        if self.job is None and self.loaded < len(self.text):
+            self.job = self.text_widget.after(0, self.step)
+
+    # Function to stop inserting
+    def cancel(self):
+        if self.job is not None:
+            self.text_widget.after_cancel(self.job)
+            self.job = None
+
+    # Function to insert slices for one frame budget
+    def step(self):
+        self.job = None
+        clock = self.clock
+        text = self.text
+        deadline = clock() + self.budget
+        while self.loaded < len(text):
+            started = clock()
+            end = min(len(text), self.loaded + self.slice_size)
+            self.text_widget.insert("end-1c", text[self.loaded:end])
+            self.loaded = end
+
+            # Aim for slices taking between 1/8 and 1/2 of the budget
+            finished = clock()
+            if finished - started < self.budget / 8:
+                self.slice_size *= 2
+            elif finished - started > self.budget / 2:
+                self.slice_size = max(self.min_slice, self.slice_size // 2)
+            if finished >= deadline:
+                break
+
+        if self.on_step is not None:
+            self.on_step()
+        self.resume()
+
+
+# Shows the whole document in the Text widget instead of a window around
+# the current word. It is inserted in the background by an
+# IncrementalInserter, so reading can start while the tail is still
+# loading; a word that has not been inserted yet is highlighted as soon as
+# it is. `on_progress` is called with the fraction inserted so far
+class FullTextView(VirtualTextView):
+    def __init__(self, text_widget, color, on_progress=None):
+        super().__init__(text_widget, color)
+        self.inserter = IncrementalInserter(text_widget, self.inserted)
+        self.on_progress = on_progress
+        self.pending = None  # (first, last) waiting to be inserted before it is highlighted
+
+    def load(self, text, word_index):
+        self.inserter.cancel()
+        super().load(text, word_index)
+        self.pending = None
+        self.first_line, self.first_column = 1, 0
+        self.inserter.start(text)
+
+    def clear(self):
+        self.inserter.cancel()
+        self.pending = None
+        super().clear()
+        self.inserter.text = ""
+        self.inserter.loaded = 0
+        if self.on_progress is not None:
+            self.on_progress(1.0)
+
+    # Returns the fraction of the document inserted so far
+    def progress(self):
+        return self.inserter.loaded / len(self.text) if self.text else 1.0
+
+    def inserted(self):
+        if self.pending is not None:
+            self.highlight_word(*self.pending)
+        if self.on_progress is not None:
+            self.on_progress(self.progress())
+
+    def highlight_word(self, first, last=None):
+        self.inserter.resume()  # The document may have grown
+        if self.word_index.ends[first if last is None else last] > self.inserter.loaded:
+            self.pending = (first, last)
+            return
+        self.pending = None
+        self.highlighter.move_to(*self.tk_range(first, last))
@@ -0,0 +1,95 @@
+import tkinter.font
+
+
+# Returns the index of the optimal recognition point of a word: the letter
+# the eye should land on, a little left of the middle. Leading punctuation
+# (quotes, brackets) is skipped
+def orp_index(word):
+    lead = 0
+    while lead < len(word) - 1 and not word[lead].isalnum():
+        lead += 1
+    length = len(word) - lead
+    if length <= 1:
+        return lead
+    if length <= 5:
+        return lead + 1
+    if length <= 9:
+        return lead + 2
+    if length <= 13:
+        return lead + 3
+    return lead + 4
+
+
+# Shows the current word on a Canvas as a single text item that is only
+# ever re-texted and moved, so a new word never changes the size of a
+# widget and never makes Tk lay the window out again (reconfiguring a
+# Label's text does). Words are placed so their optimal recognition point
+# sits under a fixed pivot mark; chunks of several words are centered.
+# Placing a word needs two font measurements, which are memoized per word
+class WordCanvas:
+    max_cached_words = 50_000
+
+    def __init__(self, canvas, font, color):
+        self.canvas = canvas
+        self.font = tkinter.font.Font(root=canvas, font=font)
+        self.offsets = {}  # Word -> x of its start relative to the pivot
+        self.center = int(canvas["width"]) // 2
+        self.middle = int(canvas["height"]) // 2
+        marker = dict(fill="gray", width=1)
+        top = self.middle - self.font.metrics("linespace") // 2
+        bottom = self.middle + self.font.metrics("linespace") // 2
+        self.marks = (canvas.create_line(self.center, top - 8, self.center, top - 2, **marker),
+                      canvas.create_line(self.center, bottom + 2, self.center, bottom + 8, **marker))
+        self.item = canvas.create_text(self.center, self.middle, text="", font=self.font, fill=color, anchor="w")
+        self.message = canvas.create_text(self.center, self.middle, text="", font=self.font, fill=color,
+                                          anchor="center", justify="center", width=self.center * 2)
+        canvas.bind("<Configure>", self.resized)
+
+    # Function to keep the pivot in the middle when the canvas is resized
+    def resized(self, event):
+        shift = event.width // 2 - self.center
+        self.center = event.width // 2
+        for item in self.marks + (self.item, self.message):
+            self.canvas.move(item, shift, 0)
+        self.canvas.itemconfigure(self.message, width=event.width)
+
+    # Returns the x of a word's start relative to the pivot
+    def offset(self, word):
+        offset = self.offsets.get(word)
+        if offset is None:
+            measure = self.font.measure
+            if " " in word:
+                offset = -measure(word) // 2
+            else:
+                pivot = orp_index(word)
+                offset = -(measure(word[:pivot]) + measure(word[pivot]) // 2)
+            if len(self.offsets) >= self.max_cached_words:
+                self.offsets.clear()
+            self.offsets[word] = offset
+        return offset
+
+    # Function to show a word (or chunk) on the pivot
+    def show_word(self, word):
+        canvas = self.canvas
+        if word:
+            canvas.coords(self.item, self.center + self.offset(word), self.middle)
+        canvas.itemconfigure(self.item, text=word)
+        canvas.itemconfigure(self.message, text="")
+
+    # Function to show a message (e.g. an error) centered and wrapped
+    def show_message(self, text):
+        self.canvas.itemconfigure(self.item, text="")
+        self.canvas.itemconfigure(self.message, text=text)
+
+    def clear(self):
+        self.show_word("")
+
+    def set_color(self, color):
+        self.canvas.itemconfigure(self.item, fill=color)
+        self.canvas.itemconfigure(self.message, fill=color)
+
+    def after(self, delay_ms, callback):
+        return self.canvas.after(delay_ms, callback)
+
+    def after_cancel(self, job):
+        self.canvas.after_cancel(job)